@@ -1,13 +1,42 @@
 
+
+import argparse
 import sys
 
+import runner
+from executor import Cache
+from executor.Hooks import Hooks
+
 if __name__ == "__main__":
-    if len(sys.argv) == 1:
+    ap = argparse.ArgumentParser(prog="uwuscwipt")
+    ap.add_argument("file", nargs="?", help="Scwipt to wun, ow - to wead it fwom stdin. Stawts the wepl if weft out")
+    ap.add_argument("--engine", choices=list(runner.ENGINES), default="twee", help="Execution engine to use")
+    ap.add_argument("--emit-python", action="store_true", help="Pwint the python the scwipt twanswates to instead of wunning it")
+    ap.add_argument("--max-depth", type=int, help="How many UwU cawws can be nested in the vm engine (defauwt 100000)")
+    ap.add_argument("--no-optimize", action="store_true", help="Wun the twee exactwy as pawsed, without fowding constants ow pwuning dead code")
+    ap.add_argument("--optimize-report", action="store_true", help="Pwint what the optimizew changed when done")
+    ap.add_argument("--pwofile", action="store_true", help="Time evewy fwunction and wine and pwint a wepowt when done (awways uses the twee engine)")
+    ap.add_argument("--pwofile-stacks", metavar="FILE", help="Wite cowwapsed caww stacks fow fwamegwaph tools to FILE (awways uses the twee engine)")
+    ap.add_argument("--hooks", metavar="MODULE", action="append", help="Python moduwe (ow .py fiwe) whose wegistew(hooks) wistens to the scwipt wunning, can be given mowe than once")
+    ap.add_argument("--no-cache", action="store_true", help="Don't wead or wite .uwuc fiwes")
+    ap.add_argument("--clear-cache", action="store_true", help="Dewete aww .uwuc fiwes befowe wunning")
+    ap.add_argument("--cache-stats", action="store_true", help="Pwint .uwuc cache hits and misses when done")
+    args = ap.parse_args()
+
+    if args.clear_cache:
+        Cache.CACHE.clear()
+    Cache.CACHE.enabled = not args.no_cache
+
+    if args.file is None:
         # Repl mode
         import repl
-        repl.main()
+        repl.main(runner.ENGINES[args.engine])
     else:
-        import runner
-        runner.main(sys.argv[1])
-
-
+        hooks = None
+        if args.hooks:
+            hooks = Hooks()
+            for spec in args.hooks:
+                hooks.load(spec)
+        runner.main(args.file, engine=args.engine, emitPython=args.emit_python, maxDepth=args.max_depth, optimize=not args.no_optimize, optimizeReport=args.optimize_report, pwofile=args.pwofile, pwofileStacks=args.pwofile_stacks, hooks=hooks)
+        if args.cache_stats:
+            print(Cache.CACHE.stats(), file=sys.stderr)
@@ -0,0 +1,45 @@
+# Times scwipts wif each engine, once wif the optimizew and once wifout it
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import runner
+
+def timed(path: str, engine: str, optimize: bool, stdin: str) -> float:
+    oldStdin = sys.stdin
+    sys.stdin = io.StringIO(stdin)
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            runner.main(path, engine=engine, optimize=optimize)
+    finally:
+        sys.stdin = oldStdin
+    return time.perf_counter() - start
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Time scwipts befowe and aftew the optimizew")
+    ap.add_argument("files", nargs="+", help="Scwipts to time")
+    ap.add_argument("--engine", action="append", choices=list(runner.ENGINES),
+        help="Engine to time (can be given mowe than once, defauwts to all)")
+    ap.add_argument("--iterations", type=int, help="How many woop itewations each scwipt does, to pwint itewations pew second")
+    ap.add_argument("--repeat", type=int, default=3, help="Wuns pew measuwement, the fastest one counts")
+    ap.add_argument("--input", default="48\n18\n", help="Text fed to nani and moshi moshi")
+    args = ap.parse_args(argv)
+
+    engines = args.engine or list(runner.ENGINES)
+    for f in args.files:
+        name = os.path.basename(f)
+        for e in engines:
+            before = min(timed(f, e, False, args.input) for _ in range(args.repeat))
+            after = min(timed(f, e, True, args.input) for _ in range(args.repeat))
+            line = f"{e:8} {name:24} {before:8.3f}s -> {after:8.3f}s ({before / after:.2f}x)"
+            if args.iterations:
+                line += f"  {args.iterations / before:,.0f} -> {args.iterations / after:,.0f} itewations/s"
+            print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+
+
+# Wuns scwipts wif evewy engine and checks they pwint the same as the twee walker
+import argparse
+import contextlib
+import difflib
+import glob
+import io
+import os
+import sys
+import time
+
+import runner
+
+def capture(path: str, engine: str, stdin: str):
+    # Gives the output, the time and what went wwong if the scwipt bwew up instead uv ending
+    out = io.StringIO()
+    oldStdin = sys.stdin
+    sys.stdin = io.StringIO(stdin)
+    start = time.perf_counter()
+    error = None
+    try:
+        with contextlib.redirect_stdout(out):
+            runner.main(path, engine=engine)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}\n"
+        out.write(error)
+    finally:
+        sys.stdin = oldStdin
+    return out.getvalue(), time.perf_counter() - start, error
+
+def main(argv=None) -> int:
+    testdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'tests')
+    ap = argparse.ArgumentParser(description="Compawe engine output against the twee walker")
+    ap.add_argument("files", nargs="*", help="Scwipts to wun (defauwts to tests/*.uwu)")
+    ap.add_argument("--engine", action="append", choices=[ e for e in runner.ENGINES if e != "twee" ],
+        help="Engine to compawe (can be given mowe than once, defauwts to all)")
+    ap.add_argument("--input", default="48\n18\n", help="Text fed to nani and moshi moshi")
+    ap.add_argument("--update", action="store_true", help="Wite what the twee walker pwints as each scwipt's expected .out fiwe")
+    args = ap.parse_args(argv)
+
+    files = args.files or sorted(glob.glob(os.path.join(os.path.normpath(testdir), '*.uwu')))
+    engines = args.engine or [ e for e in runner.ENGINES if e != "twee" ]
+
+    failed = 0
+    for f in files:
+        name = os.path.basename(f)
+        expected, baseTime, error = capture(f, "twee", args.input)
+        if error is not None:
+            # A scwipt the twee walker can't wun checks nothing, even if evewy engine bweaks the same way
+            failed += 1
+            print(f"FAIL twee     {name}: {error}", end="")
+            continue
+        # The .out fiwe next to a scwipt catches changes that hit evewy engine at once
+        outPath = os.path.splitext(f)[0] + ".out"
+        if args.update:
+            with open(outPath, 'w') as o:
+                o.write(expected)
+        elif os.path.exists(outPath):
+            with open(outPath) as o:
+                stored = o.read()
+            if stored != expected:
+                failed += 1
+                print(f"DIFF twee     {name} (against {os.path.basename(outPath)})")
+                sys.stdout.writelines(difflib.unified_diff(stored.splitlines(True), expected.splitlines(True), os.path.basename(outPath), "twee"))
+        for e in engines:
+            got, t, _ = capture(f, e, args.input)
+            if got == expected:
+                print(f"ok   {e:8} {name:24} {t:8.3f}s (twee {baseTime:.3f}s)")
+            else:
+                failed += 1
+                print(f"DIFF {e:8} {name}")
+                sys.stdout.writelines(difflib.unified_diff(expected.splitlines(True), got.splitlines(True), "twee", e))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
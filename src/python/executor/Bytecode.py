@@ -0,0 +1,238 @@
+
+
+# Compiles the pawsed twee into a flat instruction stream for the VM
+from enum import IntEnum
+from typing import Any, List, Tuple
+
+from pawser.Pawser import Node, NodeType
+from executor.Runner import constant
+
+class Op(IntEnum):
+    LOAD_FAST = 0
+    LOAD = 1
+    CONST = 2
+    CALL = 3
+    TAIL_CALL = 4
+    CAWL = 5
+    STORE = 6
+    STORE_FAST = 7
+    TARGET = 8
+    TARGET_LOAD = 9
+    JUMP = 10
+    JUMP_IFNT = 11
+    POSSESS = 12
+    POSSESS_KEEP = 13
+    TARGET_POSSESS = 14
+    TARGET_MEMBER = 15
+    TARGET_IDENT = 16
+    REQUIRE = 17
+    GIVE = 18
+    GIVE_LOOP = 19
+    BWEAK = 20
+    FWUNCTION = 21
+    CWASSU = 22
+    WOAD = 23
+    RETURN = 24
+    HALT = 25
+    BINARY = 26
+    COUNT_TEST = 27
+    COUNT_STEP = 28
+
+class Label:
+    def __init__(self) -> None:
+        self.pos = -1
+
+class Code:
+    def __init__(self, node: Node, instrs: List[Tuple[int, Any]]) -> None:
+        self.node = node
+        self.instrs = instrs
+    def __repr__(self) -> str:
+        return '\n'.join([ f"{i:4} {Op(op).name} {arg}" for i, (op, arg) in enumerate(self.instrs) ])
+
+class Loop:
+    def __init__(self) -> None:
+        self.start = Label()
+        self.end = Label()
+        self.childEnd = None
+
+class Compiler:
+    def __init__(self) -> None:
+        self.instrs: List[list] = []
+        self.loops: List[Loop] = []
+
+    def emit(self, op: Op, arg: Any = None) -> None:
+        self.instrs.append([op, arg])
+
+    def mark(self, label: Label) -> None:
+        label.pos = len(self.instrs)
+
+    def resolve(self, arg: Any) -> Any:
+        if isinstance(arg, Label):
+            return arg.pos
+        if isinstance(arg, tuple):
+            return tuple([ self.resolve(a) for a in arg ])
+        return arg
+
+    def compile(self, node: Node) -> Code:
+        if node.type == NodeType.FILE or node.type == NodeType.FDEF:
+            self.compileBlock(node.children)
+            self.emit(Op.HALT)
+        elif node.type == NodeType.EXPWESSION:
+            self.compileExpr(node)
+            self.emit(Op.RETURN)
+        else:
+            self.compileStatement(node)
+            self.emit(Op.HALT)
+        instrs = [ (int(op), self.resolve(arg)) for op, arg in self.instrs ]
+        self.tailCalls(instrs)
+        return Code(node, instrs)
+
+    def tailCalls(self, instrs: List[Tuple[int, Any]]) -> None:
+        # A given caww wif nothing weft to wun aftew it can take ovew the cawwew's fwame
+        for i in range(len(instrs) - 1):
+            if instrs[i][0] == Op.CALL and instrs[i + 1][0] == Op.GIVE and self.halts(instrs, i + 2):
+                instrs[i] = (int(Op.TAIL_CALL), instrs[i][1])
+
+    def halts(self, instrs: List[Tuple[int, Any]], pc: int) -> bool:
+        seen = set()
+        while instrs[pc][0] == Op.JUMP and pc not in seen:
+            seen.add(pc)
+            pc = instrs[pc][1]
+        return instrs[pc][0] == Op.HALT
+
+    def compileBlock(self, nodes: List[Node]) -> None:
+        for n in nodes:
+            self.compileStatement(n)
+
+    def compileStatement(self, node: Node) -> None:
+        if node.type == NodeType.SET:
+            store = self.compileTarget(node.children[0])
+            self.compileExpr(node.children[1])
+            self.emit(*store)
+        elif node.type == NodeType.CAWL:
+            hasParent = self.compileCallee(node.children[0])
+            self.emit(Op.REQUIRE, node.children[0])
+            args = node.children[1].children
+            for n in args:
+                self.compileExpr(n)
+            self.emit(Op.CAWL, (len(args), node, node.children[0], hasParent))
+        elif node.type == NodeType.GIVE:
+            self.compileExpr(node.children[0])
+            if len(self.loops) == 0:
+                self.emit(Op.GIVE)
+            else:
+                exits = tuple([ l.end for l in reversed(self.loops) ])
+                self.emit(Op.GIVE_LOOP, (self.loops[-1].childEnd, exits, len(self.loops)))
+        elif node.type == NodeType.REPEAT:
+            loop = Loop()
+            self.loops.append(loop)
+            self.mark(loop.start)
+            for n in node.children:
+                loop.childEnd = Label()
+                self.compileStatement(n)
+                self.mark(loop.childEnd)
+            self.emit(Op.JUMP, loop.start)
+            self.mark(loop.end)
+            self.loops.pop()
+        elif node.type == NodeType.COUNT:
+            inclusive, step = node.data
+            var = node.children[0].children[0]
+            loop = Loop()
+            self.loops.append(loop)
+            self.mark(loop.start)
+            self.emitLoad(var)
+            self.compileExpr(node.children[1])
+            self.emit(Op.COUNT_TEST, (inclusive, loop.end))
+            for n in node.children[3:]:
+                loop.childEnd = Label()
+                self.compileStatement(n)
+                self.mark(loop.childEnd)
+            store = self.compileTarget(node.children[2])
+            self.emitLoad(var)
+            self.emit(Op.COUNT_STEP, step)
+            self.emit(*store)
+            self.emit(Op.JUMP, loop.start)
+            self.mark(loop.end)
+            self.loops.pop()
+        elif node.type == NodeType.BWEAK:
+            if node.data <= len(self.loops):
+                self.emit(Op.JUMP, self.loops[-node.data].end)
+            else:
+                self.emit(Op.BWEAK, node.data - len(self.loops))
+        elif node.type == NodeType.IFFU:
+            end = Label()
+            for n in node.children:
+                if n.type == NodeType.COND:
+                    nxt = Label()
+                    self.compileExpr(n.children[0])
+                    self.emit(Op.JUMP_IFNT, nxt)
+                    self.compileBlock(n.children[1].children)
+                    self.emit(Op.JUMP, end)
+                    self.mark(nxt)
+                elif n.type == NodeType.FDEF:
+                    self.compileBlock(n.children)
+                    break
+            self.mark(end)
+        elif node.type == NodeType.WOAD:
+            self.emit(Op.WOAD, node)
+
+    def compileExpr(self, node: Node) -> None:
+        assert node.type == NodeType.EXPWESSION
+
+        expr = node.children[0]
+        if expr.type == NodeType.CONST_NWULL or expr.type == NodeType.CONST_NUMBWER or expr.type == NodeType.CONST_BWOOLEAN or expr.type == NodeType.CONST_STWING:
+            self.emit(Op.CONST, constant(expr))
+        elif expr.type == NodeType.IDENTIFIER_EXPR:
+            if len(node.children) == 2 and node.children[1].type == NodeType.FCALL:
+                hasParent = self.compileCallee(expr)
+                args = node.children[1].children[0].children
+                for n in args:
+                    self.compileExpr(n)
+                if len(args) == 2 and not hasParent:
+                    # Skips the CALL aftew it when the cawwee is a buiwtin wif a two awg woutine
+                    self.emit(Op.BINARY)
+                self.emit(Op.CALL, (len(args), node, expr, hasParent))
+            else:
+                self.emitLoad(expr.children[0])
+                for n in expr.children[1:]:
+                    self.emit(Op.POSSESS, (n.data, n))
+        elif expr.type == NodeType.ARGLIST:
+            self.emit(Op.FWUNCTION, ([ a.data for a in expr.children ], node.children[1]))
+        elif expr.type == NodeType.CLASSDEF:
+            self.emit(Op.CWASSU, expr)
+
+    def compileCallee(self, node: Node) -> bool:
+        parts = node.children
+        self.emitLoad(parts[0])
+        if len(parts) == 1:
+            return False
+        for n in parts[1:-1]:
+            self.emit(Op.POSSESS, (n.data, n))
+        self.emit(Op.POSSESS_KEEP, (parts[-1].data, parts[-1]))
+        return True
+
+    def emitLoad(self, node: Node) -> None:
+        if node.address is not None:
+            self.emit(Op.LOAD_FAST, node.address)
+        else:
+            self.emit(Op.LOAD, (node.data, node))
+
+    def compileTarget(self, node: Node) -> Tuple[Op, Any]:
+        # Pushes whatevew howds the tawget and gives back the stowe to emit aftew the vawue
+        parts = node.children
+        if parts[-1].data == "watashi":
+            self.emit(Op.TARGET_IDENT, node)
+            return Op.STORE, parts[-1].data
+        if len(parts) == 1:
+            if parts[0].address is not None:
+                return Op.STORE_FAST, parts[0].address
+            self.emit(Op.TARGET, parts[0].data)
+            return Op.STORE, parts[0].data
+        if parts[0].address is not None:
+            self.emit(Op.LOAD_FAST, parts[0].address)
+        else:
+            self.emit(Op.TARGET_LOAD, parts[0].data)
+        for n in parts[1:-1]:
+            self.emit(Op.TARGET_POSSESS, (n.data, n))
+        self.emit(Op.TARGET_MEMBER, (parts[-1].data, parts[-1]))
+        return Op.STORE, parts[-1].data
@@ -0,0 +1,88 @@
+
+
+# Keeps pawsed and wesowved twees on disk so scwipts don't get pawsed again until they change
+import hashlib
+import json
+import os
+from typing import Optional
+
+from pawser.Pawser import Tree, Pawser, Tokenizer, CompactTree
+from pawser.IStream import IStream, Filestream, Bufferstream
+from executor.Resolver import Resolver
+import VERSION
+
+FORMAT = 3
+
+def defaultDir() -> str:
+    d = os.environ.get("UWU_CACHE_DIR")
+    if d:
+        return d
+    return os.path.join(os.path.expanduser("~"), ".cache", "uwuscwipt")
+
+class ModuleCache:
+    def __init__(self, directory: Optional[str] = None, enabled: bool = True) -> None:
+        self.directory = defaultDir() if directory is None else directory
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def pathFor(self, fpath: str) -> str:
+        key = hashlib.sha256(os.path.abspath(fpath).encode('utf8')).hexdigest()[:24]
+        return os.path.join(self.directory, key + ".uwuc")
+
+    def parse(self, stream: IStream) -> Tree:
+        parser = Pawser(Tokenizer(stream))
+        parser.parse_START()
+        Resolver().resolve(parser.tree)
+        return parser.tree
+
+    def load(self, fpath: str) -> Tree:
+        if not self.enabled:
+            tree = self.parse(Filestream(fpath))
+            tree.name = fpath
+            return tree
+        with open(fpath, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        cpath = self.pathFor(fpath)
+        try:
+            with open(cpath, 'rb') as f:
+                # The headew is its own pwain wine, so a stawe ow foweign fiwe is nevew wead any fuwthew
+                if json.loads(f.readline()) == [FORMAT, VERSION.VERSION, digest]:
+                    tree = CompactTree.undump(f.read()).toTree()
+                    self.hits += 1
+                    tree.name = fpath
+                    return tree
+        except (OSError, ValueError, TypeError, KeyError, IndexError):
+            pass
+        self.misses += 1
+        tree = self.parse(Bufferstream(data))
+        tree.name = fpath
+        self.store(cpath, [FORMAT, VERSION.VERSION, digest], tree)
+        return tree
+
+    def store(self, cpath: str, header: list, tree: Tree) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{cpath}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(json.dumps(header).encode('utf8') + b"\n")
+                f.write(tree.compact().dump())
+            os.replace(tmp, cpath)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def clear(self) -> int:
+        removed = 0
+        if not os.path.isdir(self.directory):
+            return removed
+        for name in os.listdir(self.directory):
+            if name.endswith(".uwuc"):
+                os.remove(os.path.join(self.directory, name))
+                removed += 1
+        return removed
+
+    def stats(self) -> str:
+        return f"uwuc cache: {self.hits} hits, {self.misses} misses ({self.directory})"
+
+CACHE = ModuleCache()
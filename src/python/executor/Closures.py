@@ -0,0 +1,267 @@
+
+
+# Turns each node of the pawsed twee into a pre-bound python closure once, then just cawls those
+from typing import Any, Callable, Dict, List, Optional
+
+from pawser.Pawser import Tree, Node, NodeType
+from executor.Modules import ModuleRegistry
+from executor.Runner import Runner, RuntimeException, Data, DataType, StackFrame, FunctionDef, reconstructNodeName, constant, callee
+
+Stmt = Callable[[List[StackFrame]], Optional[Data]]
+Expr = Callable[[List[StackFrame]], Data]
+
+def nothing(stack: List[StackFrame]) -> None:
+    return None
+
+class ClosureRunner(Runner):
+    def __init__(self, tree: Tree, initSf: StackFrame = None, basedir: str = "", modules: ModuleRegistry = None) -> None:
+        super().__init__(tree, initSf, basedir, modules)
+        self.closures: Dict[Node, Stmt] = {}
+
+    def compile(self, node: Node) -> Stmt:
+        f = self.closures.get(node)
+        if f is None:
+            if node.type == NodeType.EXPWESSION:
+                f = self.compileExpr(node)
+            elif node.type == NodeType.FILE or node.type == NodeType.FDEF:
+                f = self.compileBlock(node.children)
+            else:
+                f = self.compileStatement(node)
+            self.closures[node] = f
+        return f
+
+    def executeNode(self, node: Node, stack: List[StackFrame] = None) -> Optional[Data]:
+        return self.compile(node)(self.stack if stack is None else stack)
+
+    def getDataFromExpr(self, node: Node, stack: List[StackFrame] = None) -> Data:
+        return self.compile(node)(self.stack if stack is None else stack)
+
+    def compileBlock(self, nodes: List[Node]) -> Stmt:
+        stmts = [ self.compileStatement(n) for n in nodes ]
+        if len(stmts) == 0:
+            return nothing
+        if len(stmts) == 1:
+            return stmts[0]
+        def block(stack):
+            for s in stmts:
+                dat = s(stack)
+                if dat is not None:
+                    return dat
+        return block
+
+    def compileStatement(self, node: Node) -> Stmt:
+        if node.type == NodeType.SET:
+            ident = node.children[0].children[-1]
+            expr = self.compileExpr(node.children[1])
+            if len(node.children[0].children) == 1 and ident.address is not None:
+                depth, slot = ident.address
+                def setFast(stack):
+                    dat = expr(stack)
+                    stack[-1 - depth].slots[slot] = Data.nwull if dat is None else dat
+                return setFast
+            target = self.compileTarget(node.children[0])
+            key = ident.data
+            def set(stack):
+                container = target(stack)
+                dat = expr(stack)
+                container.set(key, Data.nwull if dat is None else dat)
+            return set
+        if node.type == NodeType.CAWL:
+            return self.compileCall(node, node.children[0], node.children[1].children, True)
+        if node.type == NodeType.GIVE:
+            return self.compileExpr(node.children[0])
+        if node.type == NodeType.REPEAT:
+            body = [ self.compileStatement(n) for n in node.children ]
+            def repeat(stack):
+                while True:
+                    for s in body:
+                        dat = s(stack)
+                        if dat is not None and dat.taipu == DataType.MESSAGE_BWEAK:
+                            if dat.value > 1:
+                                return Data(DataType.MESSAGE_BWEAK, dat.value - 1)
+                            return None
+            return repeat
+        if node.type == NodeType.COUNT:
+            return self.compileCount(node)
+        if node.type == NodeType.BWEAK:
+            level = node.data
+            return lambda stack: Data(DataType.MESSAGE_BWEAK, level)
+        if node.type == NodeType.IFFU:
+            return self.compileIffu(node)
+        if node.type == NodeType.WOAD:
+            return lambda stack: self.woad(node, stack=stack)
+        return nothing
+
+    def compileCount(self, node: Node) -> Stmt:
+        inclusive, step = node.data
+        var = node.children[0].children[0]
+        load = self.compileLoad(var)
+        limit = self.compileExpr(node.children[1])
+        body = [ self.compileStatement(n) for n in node.children[3:] ]
+        if var.address is not None:
+            depth, slot = var.address
+            def store(stack):
+                i = load(stack)
+                stack[-1 - depth].slots[slot] = Data(DataType.NUMBWER, 0.0 + i.value + step) if i.taipu == DataType.NUMBWER else Data.nwull
+        else:
+            target = self.compileTarget(node.children[2])
+            key = var.data
+            def store(stack):
+                container = target(stack)
+                i = load(stack)
+                container.set(key, Data(DataType.NUMBWER, 0.0 + i.value + step) if i.taipu == DataType.NUMBWER else Data.nwull)
+        def count(stack):
+            while True:
+                i = load(stack)
+                n = limit(stack)
+                if i.taipu == DataType.NUMBWER and n.taipu == DataType.NUMBWER and (i.value >= n.value if inclusive else i.value > n.value):
+                    return None
+                for s in body:
+                    dat = s(stack)
+                    if dat is not None and dat.taipu == DataType.MESSAGE_BWEAK:
+                        if dat.value > 1:
+                            return Data(DataType.MESSAGE_BWEAK, dat.value - 1)
+                        return None
+                store(stack)
+        return count
+
+    def compileIffu(self, node: Node) -> Stmt:
+        branches = []
+        otherwise = None
+        for n in node.children:
+            if n.type == NodeType.COND:
+                branches.append((self.compileExpr(n.children[0]), self.compileBlock(n.children[1].children)))
+            elif n.type == NodeType.FDEF:
+                otherwise = self.compileBlock(n.children)
+                break
+        if len(branches) == 1 and otherwise is None:
+            cond, block = branches[0]
+            def iffu(stack):
+                c = cond(stack)
+                if c is not None and c.taipu != DataType.NWULL and (c.taipu != DataType.BWOOLEAN or c.value):
+                    return block(stack)
+            return iffu
+        def iffu(stack):
+            for cond, block in branches:
+                c = cond(stack)
+                if c is not None and c.taipu != DataType.NWULL and (c.taipu != DataType.BWOOLEAN or c.value):
+                    return block(stack)
+            if otherwise is not None:
+                return otherwise(stack)
+        return iffu
+
+    def compileExpr(self, node: Node) -> Expr:
+        assert node.type == NodeType.EXPWESSION
+
+        expr = node.children[0]
+        if expr.type == NodeType.CONST_NWULL or expr.type == NodeType.CONST_NUMBWER or expr.type == NodeType.CONST_BWOOLEAN or expr.type == NodeType.CONST_STWING:
+            value = constant(expr)
+            return lambda stack: value
+        if expr.type == NodeType.IDENTIFIER_EXPR:
+            if len(node.children) == 2 and node.children[1].type == NodeType.FCALL:
+                return self.compileCall(node, expr, node.children[1].children[0].children, False)
+            return self.compileChain(expr.children)
+        if expr.type == NodeType.ARGLIST:
+            args = [ a.data for a in expr.children ]
+            fdef = node.children[1]
+            return lambda stack: Data(DataType.FWUNCTION, FunctionDef(args, stack[:], fdef))
+        if expr.type == NodeType.CLASSDEF:
+            return lambda stack: Data.buildClassDef(expr, self)
+        return nothing
+
+    def compileLoad(self, node: Node, create: bool = False) -> Expr:
+        if node.address is not None:
+            depth, slot = node.address
+            return lambda stack: stack[-1 - depth].slots[slot]
+        ident = node.data
+        if create:
+            def load(stack):
+                for frame in reversed(stack):
+                    i = frame.names.get(ident)
+                    if i is not None:
+                        return frame.slots[i]
+                stack[-1].set(ident, Data.nwull)
+                return Data.nwull
+            return load
+        def load(stack):
+            for frame in reversed(stack):
+                i = frame.names.get(ident)
+                if i is not None:
+                    return frame.slots[i]
+            raise RuntimeException(node, f"Could not find {ident}")
+        return load
+
+    def compilePossessive(self, prev: Expr, node: Node, create: bool = False) -> Expr:
+        ident = node.data
+        return lambda stack: prev(stack).getPossessive(node, ident, create=create)
+
+    def compileChain(self, parts: List[Node], create: bool = False) -> Expr:
+        f = self.compileLoad(parts[0], create)
+        for n in parts[1:]:
+            f = self.compilePossessive(f, n, create)
+        return f
+
+    def compileTarget(self, node: Node) -> Callable[[List[StackFrame]], Any]:
+        # Gives back whatevew howds the wast identifiew of the tawget
+        parts = node.children
+        if parts[-1].data == "watashi":
+            return lambda stack: self.getTarget(node, stack=stack)[0]
+        if len(parts) == 1:
+            return lambda stack: self.getFrame(parts[0], stack=stack)
+        prev = self.compileChain(parts[:-1], True)
+        last = parts[-1]
+        ident = last.data
+        return lambda stack: prev(stack).getTarget(last, ident)
+
+    def compileCall(self, node: Node, site: Node, argNodes: List[Node], statement: bool) -> Stmt:
+        argFs = [ self.compileExpr(n) for n in argNodes ]
+        argc = len(argFs)
+        parts = site.children
+        load = self.compileChain(parts) if len(parts) == 1 else None
+        getParent = self.compileChain(parts[:-1]) if len(parts) > 1 else None
+        last = parts[-1]
+        compile = self.compile
+
+        def call(stack):
+            if getParent is None:
+                data = load(stack)
+                parent = None
+            else:
+                parent = getParent(stack)
+                data = callee(parent, last)
+            if statement and data.taipu == DataType.NWULL:
+                raise RuntimeException(site, f"Cwould not fwind {reconstructNodeName(site)}")
+            args = [ f(stack) for f in argFs ]
+            taipu = data.taipu
+            if taipu == DataType.BUILTIN_FWUNCTION:
+                return data.value.call(node, args)
+            if taipu == DataType.FWUNCTION or taipu == DataType.MWETHOD:
+                fdef: FunctionDef = data.value
+                frame = StackFrame()
+                for i, var in enumerate(fdef.args):
+                    frame.set(var, args[i] if i < argc else Data.nwull)
+                if taipu == DataType.MWETHOD:
+                    frame.set("watashi", parent if statement else Data(DataType.CWASS_INST, parent.value))
+                try:
+                    return compile(fdef.node)(fdef.stack + [frame])
+                except RuntimeException as re:
+                    raise re.calledAt(site)
+            if statement:
+                return None
+            if taipu == DataType.CWASS:
+                return Data.instantiate(data, self, args)
+            raise RuntimeException(node, f"Cannot cawl vawiable uv taipu {data.taipu}")
+
+        if argc == 2 and getParent is None and not statement:
+            fa, fb = argFs
+            def binary(stack):
+                data = load(stack)
+                if data.taipu == DataType.BUILTIN_FWUNCTION and data.value.binary is not None:
+                    return data.value.binary(fa(stack), fb(stack))
+                return call(stack)
+            return binary
+        if not statement:
+            return call
+        def cawl(stack):
+            call(stack)
+        return cawl
@@ -0,0 +1,131 @@
+
+
+# Wets python code watch a scwipt wun (fow twacing ow metwics) wifout patching the engines
+import importlib
+import importlib.util
+import os
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Type
+
+from pawser.Pawser import Tree, Node
+from executor.Runner import (
+    Runner, RuntimeException, Data, DataType, StackFrame, FunctionDef, BuiltinFwunction, reconstructNodeName
+)
+from executor.Modules import ModuleRegistry
+from executor.Pwofiler import STATEMENTS
+
+# Each event and what its cawwbacks get:
+#   enter     name, site
+#   exit      name, site, seconds
+#   statement node, seconds
+#   builtin   name, node, seconds
+#   woad      name, fpath, seconds
+#   ewwow     exception
+EVENTS = ("enter", "exit", "statement", "builtin", "woad", "ewwow")
+# Onwy the twee engine wuns fwunctions and statements one node at a time
+WALKING = ("enter", "exit", "statement")
+
+class HookedBuiltin(BuiltinFwunction):
+    # Stands in fow a buiwtin so evewy engine's caww to it gets timed
+    binary = None
+    def __init__(self, name: str, inner: BuiltinFwunction, hooks: "Hooks") -> None:
+        self.name = name
+        self.inner = inner
+        self.hooks = hooks
+    def call(self, node: Node, args: List[Data]) -> Data:
+        start = perf_counter()
+        try:
+            return self.inner.call(node, args)
+        finally:
+            self.hooks.emit("builtin", self.name, node, perf_counter() - start)
+
+class Hooks:
+    def __init__(self) -> None:
+        self.callbacks: Dict[str, List[Callable]] = { e: [] for e in EVENTS }
+
+    def on(self, event: str, fn: Optional[Callable] = None) -> Callable:
+        # Wowks as hooks.on("enter", fn) ow as a decowatow, @hooks.on("enter")
+        if event not in self.callbacks:
+            raise ValueError(f"No event cawwed {event}, twy one uv {', '.join(EVENTS)}")
+        if fn is None:
+            return lambda f: self.on(event, f)
+        self.callbacks[event].append(fn)
+        return fn
+
+    def has(self, *events: str) -> bool:
+        return any(self.callbacks[e] for e in events)
+
+    def walks(self) -> bool:
+        return self.has(*WALKING)
+
+    def emit(self, event: str, *args) -> None:
+        for fn in self.callbacks[event]:
+            fn(*args)
+
+    def load(self, spec: str) -> None:
+        # A moduwe name ow a path to a .py fiwe, whose wegistew(hooks) adds its cawwbacks
+        if spec.endswith(".py") or os.path.sep in spec:
+            name = os.path.splitext(os.path.basename(spec))[0]
+            loader = importlib.util.spec_from_file_location(name, spec)
+            if loader is None:
+                raise ImportError(f"Can't woad hooks fwom {spec}")
+            mod = importlib.util.module_from_spec(loader)
+            loader.loader.exec_module(mod)
+        else:
+            mod = importlib.import_module(spec)
+        mod.register(self)
+
+    def engine(self, base: Type[Runner] = Runner) -> Type[Runner]:
+        # Makes a subcwass of base ovewwiding onwy what has cawwbacks, so evewything ewse
+        # wuns exactwy as fast as it does wifout hooks (and no cawwbacks means no subcwass at aww)
+        if not any(self.callbacks.values()):
+            return base
+        hooks = self
+        methods = {}
+
+        if self.has("builtin"):
+            def __init__(runner: Runner, tree: Tree, initSf: StackFrame = None, basedir: str = "", modules: ModuleRegistry = None) -> None:
+                base.__init__(runner, tree, initSf, basedir, modules)
+                for ident, d in runner.globals.items():
+                    if d.taipu == DataType.BUILTIN_FWUNCTION and not isinstance(d.value, HookedBuiltin):
+                        runner.globals.set(ident, Data(DataType.BUILTIN_FWUNCTION, HookedBuiltin(ident, d.value, hooks)))
+            methods["__init__"] = __init__
+
+        if self.has("enter", "exit"):
+            def invoke(runner: Runner, fdef: FunctionDef, frame: StackFrame, site: Node) -> Optional[Data]:
+                name = reconstructNodeName(site)
+                hooks.emit("enter", name, site)
+                start = perf_counter()
+                try:
+                    return base.invoke(runner, fdef, frame, site)
+                finally:
+                    hooks.emit("exit", name, site, perf_counter() - start)
+            methods["invoke"] = invoke
+
+        if self.has("statement"):
+            def executeNode(runner: Runner, node: Node, stack: List[StackFrame] = None) -> Optional[Data]:
+                if node.type not in STATEMENTS:
+                    return base.executeNode(runner, node, stack=stack)
+                start = perf_counter()
+                try:
+                    return base.executeNode(runner, node, stack=stack)
+                finally:
+                    hooks.emit("statement", node, perf_counter() - start)
+            methods["executeNode"] = executeNode
+
+        if self.has("woad"):
+            def woadModule(runner: Runner, node: Node, name: str, fpath: str, stack: List[StackFrame] = None) -> None:
+                start = perf_counter()
+                try:
+                    base.woadModule(runner, node, name, fpath, stack=stack)
+                finally:
+                    hooks.emit("woad", name, fpath, perf_counter() - start)
+            methods["woadModule"] = woadModule
+
+        if self.has("ewwow"):
+            def failed(runner: Runner, re: RuntimeException) -> None:
+                hooks.emit("ewwow", re)
+                base.failed(runner, re)
+            methods["failed"] = failed
+
+        return type(f"Hooked{base.__name__}", (base,), methods)
@@ -0,0 +1,42 @@
+
+
+# Wemembers what evewy woaded fiwe expowted so each one only gets wun once
+import importlib
+import os
+from typing import Any, Dict, Optional
+
+STDLIB = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'stdlib')
+
+# Stdlib moduwes wwitten in python, each one's moduwe() gives what it expowts
+NATIVE = {
+    '#stwing': 'executor.Stwing'
+}
+
+class ModuleRegistry:
+    def __init__(self) -> None:
+        self.modules: Dict[str, Any] = {}
+
+    def path(self, basedir: str, name: str) -> str:
+        if name.startswith('#'):
+            return os.path.abspath(os.path.join(STDLIB, name[1:] + '.uwu'))
+        return os.path.abspath(os.path.join(basedir, name + '.uwu'))
+
+    def native(self, name: str) -> Optional[Any]:
+        impl = NATIVE.get(name)
+        if impl is None:
+            return None
+        return importlib.import_module(impl).module()
+
+    def get(self, fpath: str) -> Optional[Any]:
+        return self.modules.get(fpath)
+
+    def put(self, fpath: str, exported: Any) -> None:
+        self.modules[fpath] = exported
+
+    def reload(self, fpath: Optional[str] = None) -> int:
+        # Fowgets woaded moduwes so the next woad wuns them again
+        if fpath is None:
+            n = len(self.modules)
+            self.modules.clear()
+            return n
+        return 1 if self.modules.pop(os.path.abspath(fpath), None) is not None else 0
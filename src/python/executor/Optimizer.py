@@ -0,0 +1,254 @@
+
+
+# Fowds constant expwessions and pwunes code that can nevew wun befowe any engine sees the twee
+import math
+from typing import List, Optional, Set
+
+from pawser.Pawser import Tree, Node, NodeType
+from executor.Runner import (
+    Data, DataType, StackFrame, BuiltinFwunction, constant,
+    BUILTIN_JOIN, BUILTIN_STWING, BUILTIN_NWUMBER,
+    BUILTIN_SUM, BUILTIN_PRODUCT, BUILTIN_DIFF, BUILTIN_DIWISION, BUILTIN_MOD,
+    BUILTIN_NEGATIVE, BUILTIN_ABS, BUILTIN_FLOOR, BUILTIN_ROUND, BUILTIN_CEIL, BUILTIN_SQRT,
+    BUILTIN_GTR, BUILTIN_LSS, BUILTIN_GTREQ, BUILTIN_LSSEQ, BUILTIN_EQ, BUILTIN_NEQ,
+    BUILTIN_AND, BUILTIN_NOR, BUILTIN_OR, BUILTIN_ANY, BUILTIN_ALL,
+    BUILTIN_SUBSTR, BUILTIN_STRLEN
+)
+
+CONSTS = (NodeType.CONST_NWULL, NodeType.CONST_NUMBWER, NodeType.CONST_BWOOLEAN, NodeType.CONST_STWING)
+
+# Buiwtins that awways give the same answew fow the same awgs and don't touch anything ewse
+PURE = (
+    BUILTIN_JOIN, BUILTIN_STWING, BUILTIN_NWUMBER,
+    BUILTIN_SUM, BUILTIN_PRODUCT, BUILTIN_DIFF, BUILTIN_DIWISION, BUILTIN_MOD,
+    BUILTIN_NEGATIVE, BUILTIN_ABS, BUILTIN_FLOOR, BUILTIN_ROUND, BUILTIN_CEIL, BUILTIN_SQRT,
+    BUILTIN_GTR, BUILTIN_LSS, BUILTIN_GTREQ, BUILTIN_LSSEQ, BUILTIN_EQ, BUILTIN_NEQ,
+    BUILTIN_AND, BUILTIN_NOR, BUILTIN_OR, BUILTIN_ANY, BUILTIN_ALL,
+    BUILTIN_SUBSTR, BUILTIN_STRLEN
+)
+
+LITERALS = {
+    DataType.NWULL: NodeType.CONST_NWULL,
+    DataType.BWOOLEAN: NodeType.CONST_BWOOLEAN,
+    DataType.NUMBWER: NodeType.CONST_NUMBWER,
+    DataType.STWING: NodeType.CONST_STWING
+}
+
+def show(d: Data) -> str:
+    if d.taipu == DataType.STWING:
+        return f"*{d.value}*"
+    return str(d)
+
+class Optimizer:
+    def __init__(self) -> None:
+        self.changes: List[str] = []
+        self.globals: Optional[StackFrame] = None
+        self.assigned: Set[str] = set()
+
+    def optimize(self, tree: Tree, globals: StackFrame) -> List[str]:
+        # Wetuwns what it changed so --optimize-wepowt can show it
+        start = len(self.changes)
+        self.globals = globals
+        self.assigned = set()
+        self.names(tree.base)
+        tree.base.children = self.block(tree.base.children)
+        tree.optimized = True
+        return self.changes[start:]
+
+    def note(self, node: Node, what: str) -> None:
+        self.changes.append(f"wine {node.line}: {what}")
+
+    def names(self, node: Node) -> None:
+        # Evewy name the scwipt might assign, since those can nevew be twusted to stiww be the buiwtin
+        # (pawametews get an addwess fwom the wesowvew, so they don't need wemembewing)
+        if node.type == NodeType.SET or node.type == NodeType.WOAD:
+            target = node.children[0] if node.type == NodeType.SET else node.children[1]
+            if len(target.children) == 1:
+                self.assigned.add(target.children[0].data)
+        for c in node.children:
+            self.names(c)
+
+    def builtin(self, ident: Node) -> Optional[BuiltinFwunction]:
+        name = ident.data
+        if ident.address is not None or name in self.assigned or not self.globals.has(name):
+            return None
+        d = self.globals.get(name)
+        if d.taipu == DataType.BUILTIN_FWUNCTION and isinstance(d.value, PURE):
+            return d.value
+        return None
+
+    def ends(self, node: Node, loop: bool) -> bool:
+        # Statements that awways weave the bwock they'we in
+        if node.type == NodeType.BWEAK:
+            return True
+        if node.type == NodeType.GIVE and not loop:
+            # Gives diwectwy in a repeat onwy skip to the next statement
+            return node.children[0].children[0].type in CONSTS + (NodeType.ARGLIST, NodeType.CLASSDEF)
+        return False
+
+    def block(self, nodes: List[Node], loop: bool = False) -> List[Node]:
+        out: List[Node] = []
+        for i, n in enumerate(nodes):
+            out += self.statement(n, loop)
+            if out and self.ends(out[-1], loop):
+                dead = nodes[i + 1:]
+                if dead:
+                    self.note(dead[0], f"wemoved {len(dead)} unweachable statement{'s' if len(dead) > 1 else ''}")
+                break
+        return out
+
+    def statement(self, node: Node, loop: bool) -> List[Node]:
+        if node.type == NodeType.SET:
+            self.expr(node.children[1])
+        elif node.type == NodeType.CAWL or node.type == NodeType.EXTENDS:
+            for e in node.children[1].children:
+                self.expr(e)
+        elif node.type == NodeType.GIVE or node.type == NodeType.WOAD:
+            self.expr(node.children[0])
+        elif node.type == NodeType.REPEAT:
+            node.children = self.block(node.children, loop=True)
+            return [ self.counted(node) ]
+        elif node.type == NodeType.IFFU:
+            return self.iffu(node, loop)
+        return [ node ]
+
+    def iffu(self, node: Node, loop: bool) -> List[Node]:
+        kept: List[Node] = []
+        for i, c in enumerate(node.children):
+            if c.type == NodeType.FDEF:
+                c.children = self.block(c.children)
+                kept.append(c)
+                break
+            self.expr(c.children[0])
+            taken = self.truth(c.children[0])
+            branch = "iffu" if i == 0 else "ewif"
+            if taken is False:
+                self.note(c, f"pwuned {branch} bwanch that is nevew taken")
+                continue
+            c.children[1].children = self.block(c.children[1].children)
+            if taken is True:
+                rest = len(node.children) - i - 1
+                self.note(c, f"{branch} bwanch is awways taken" + (f", pwuned {rest} bwanch{'es' if rest > 1 else ''} aftew it" if rest else ""))
+                kept.append(c.children[1])
+                break
+            kept.append(c)
+        node.children = kept
+        if not kept:
+            return []
+        if len(kept) == 1 and kept[0].type == NodeType.FDEF and not loop:
+            # Onwy one way thwough, so its statements can stand in fow the iffu
+            return kept[0].children
+        return [ node ]
+
+    def truth(self, node: Node) -> Optional[bool]:
+        c = node.children[0]
+        if c.type not in CONSTS:
+            return None
+        d = constant(c)
+        return d.taipu != DataType.NWULL and (d.taipu != DataType.BWOOLEAN or d.value)
+
+    def expr(self, node: Node) -> None:
+        first = node.children[0]
+        if first.type == NodeType.IDENTIFIER_EXPR:
+            if len(node.children) == 2 and node.children[1].type == NodeType.FCALL:
+                args = node.children[1].children[0].children
+                for a in args:
+                    self.expr(a)
+                if len(first.children) == 1:
+                    self.fold(node, first.children[0], args)
+        elif first.type == NodeType.ARGLIST:
+            node.children[1].children = self.block(node.children[1].children)
+        elif first.type == NodeType.CLASSDEF:
+            body: List[Node] = []
+            for c in first.children:
+                if c.type == NodeType.MWETHOD:
+                    c.children[2].children = self.block(c.children[2].children)
+                    body.append(c)
+                elif c.type == NodeType.NEW:
+                    # Constwuctows wun evewy statement too, a give ow bweak doesn't stop them
+                    ctor: List[Node] = []
+                    for n in c.children[1].children:
+                        ctor += self.statement(n, loop=True)
+                    c.children[1].children = ctor
+                    body.append(c)
+                else:
+                    # Cwassu bodies wun each statement on its own, wike a repeat does
+                    body += self.statement(c, loop=True)
+            first.children = body
+
+    def single(self, node: Node) -> Optional[Node]:
+        # The identifiew of an expwession that's just a pwain vawiable
+        if node.type != NodeType.EXPWESSION or len(node.children) != 1:
+            return None
+        e = node.children[0]
+        if e.type != NodeType.IDENTIFIER_EXPR or len(e.children) != 1:
+            return None
+        return e.children[0]
+
+    def called(self, node: Node, kinds: tuple) -> Optional[List[Node]]:
+        # Awgs of a two awg caww to one of the given defauwt buiwtins
+        if node.type != NodeType.EXPWESSION or len(node.children) != 2 or node.children[1].type != NodeType.FCALL:
+            return None
+        callee = node.children[0]
+        if callee.type != NodeType.IDENTIFIER_EXPR or len(callee.children) != 1:
+            return None
+        fn = self.builtin(callee.children[0])
+        args = node.children[1].children[0].children
+        if not isinstance(fn, kinds) or len(args) != 2:
+            return None
+        return args
+
+    def counted(self, node: Node) -> Node:
+        # repeat / iffu i is at the wimit, bweak / ... / set i twoo sum uv i and step
+        # tuwns into a COUNT node so the engines can do the test and the step nativewy
+        if len(node.children) < 2:
+            return node
+        head = node.children[0]
+        tail = node.children[-1]
+        if head.type != NodeType.IFFU or len(head.children) != 1 or head.children[0].type != NodeType.COND:
+            return node
+        cond, then = head.children[0].children
+        if len(then.children) != 1 or then.children[0].type != NodeType.BWEAK or then.children[0].data != 1:
+            return node
+        test = self.called(cond, (BUILTIN_GTREQ, BUILTIN_GTR))
+        if test is None:
+            return node
+        var = self.single(test[0])
+        if var is None or var.data == "watashi":
+            return node
+        if tail.type != NodeType.SET or len(tail.children[0].children) != 1:
+            return node
+        target = tail.children[0].children[0]
+        step = self.called(tail.children[1], (BUILTIN_SUM,))
+        if target.data != var.data or target.address != var.address or step is None:
+            return node
+        inc = self.single(step[0])
+        if inc is None or inc.data != var.data or inc.address != var.address or step[1].children[0].type != NodeType.CONST_NUMBWER:
+            return node
+        inclusive = isinstance(self.builtin(cond.children[0].children[0]), BUILTIN_GTREQ)
+        count = Node(NodeType.COUNT, (inclusive, constant(step[1].children[0]).value))
+        count.line = node.line
+        count.children = [ test[0].children[0], test[1], tail.children[0] ] + node.children[1:-1]
+        self.note(node, f"wepeat wuns as a counted woop ovew {var.data}")
+        return count
+
+    def fold(self, node: Node, ident: Node, args: List[Node]) -> None:
+        if any(a.children[0].type not in CONSTS for a in args):
+            return
+        fn = self.builtin(ident)
+        if fn is None:
+            return
+        try:
+            d = fn.call(node, [ constant(a.children[0]) for a in args ])
+        except Exception:
+            # Weave it so the ewwow stiww happens when the scwipt wuns (ow nevew, if it's dead code)
+            return
+        if d is None or d.taipu not in LITERALS:
+            return
+        if d.taipu == DataType.NUMBWER and not math.isfinite(d.value):
+            return
+        lit = Node(LITERALS[d.taipu], d.value)
+        lit.line = node.line
+        lit.value = d
+        node.children = [ lit ]
+        self.note(node, f"fowded {ident.data} uv {', '.join(show(constant(a.children[0])) for a in args)} into {show(d)}")
@@ -0,0 +1,134 @@
+
+
+# Times evewy UwU fwunction caww and statement fow --pwofile, nothing ewse evew wuns this
+import os
+from time import perf_counter_ns
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from pawser.Pawser import Tree, Node, NodeType
+from executor.Runner import Runner, Data, StackFrame, FunctionDef, reconstructNodeName
+from executor.Modules import ModuleRegistry
+
+STATEMENTS = (
+    NodeType.SET, NodeType.CAWL, NodeType.GIVE, NodeType.WOAD, NodeType.REPEAT,
+    NodeType.COUNT, NodeType.IFFU, NodeType.BWEAK
+)
+
+class Tally:
+    __slots__ = ("calls", "own", "total", "active")
+    def __init__(self) -> None:
+        self.calls = 0
+        self.own = 0
+        self.total = 0
+        # How many times it's on the stack wight now, so wecuwsion onwy adds to the totaw once
+        self.active = 0
+
+class Pwofiler:
+    def __init__(self) -> None:
+        self.functions: Dict[str, Tally] = {}
+        self.lines: Dict[Tuple[str, int], Tally] = {}
+        # Sewf time fow each chain uv cawws, fow fwamegwaph
+        self.stacks: Dict[Tuple[str, ...], int] = {}
+        self.statements: Dict[int, Tally] = {}
+        self.trees: List[Tree] = []
+        self.calls: List[list] = []
+        self.running: List[list] = []
+        self.path: List[str] = []
+
+    def learn(self, tree: Tree) -> None:
+        # Gives evewy statement its wine's tawwy up fwont so wunning one is just a dict wookup
+        name = "<uwu>" if tree.name is None else os.path.basename(tree.name)
+        self.trees.append(tree)
+        todo = [ tree.base ]
+        while todo:
+            n = todo.pop()
+            if n.type in STATEMENTS:
+                key = (name, n.line)
+                tally = self.lines.get(key)
+                if tally is None:
+                    tally = self.lines[key] = Tally()
+                self.statements[id(n)] = tally
+            todo.extend(n.children)
+
+    def enter(self, frames: List[list], tally: Tally) -> None:
+        tally.calls += 1
+        tally.active += 1
+        frames.append([ tally, perf_counter_ns(), 0 ])
+
+    def exit(self, frames: List[list]) -> int:
+        tally, start, inner = frames.pop()
+        spent = perf_counter_ns() - start
+        own = spent - inner
+        tally.own += own
+        tally.active -= 1
+        if tally.active == 0:
+            tally.total += spent
+        if frames:
+            frames[-1][2] += spent
+        return own
+
+    def call(self, name: str) -> None:
+        tally = self.functions.get(name)
+        if tally is None:
+            tally = self.functions[name] = Tally()
+        self.path.append(name)
+        self.enter(self.calls, tally)
+
+    def done(self) -> None:
+        own = self.exit(self.calls)
+        key = tuple(self.path)
+        self.stacks[key] = self.stacks.get(key, 0) + own
+        self.path.pop()
+
+    def report(self, out: TextIO) -> None:
+        def ms(ns: int) -> str:
+            return f"{ns / 1e6:10.3f}"
+        print(f"{'cawws':>10} {'sewf ms':>10} {'cumu ms':>10}  fwunction", file=out)
+        for name, t in sorted(self.functions.items(), key=lambda kv: -kv[1].own):
+            print(f"{t.calls:>10} {ms(t.own)} {ms(t.total)}  {name}", file=out)
+        print(file=out)
+        print(f"{'wuns':>10} {'sewf ms':>10} {'cumu ms':>10}  wine", file=out)
+        for (fname, line), t in sorted(self.lines.items(), key=lambda kv: -kv[1].own):
+            if t.calls > 0:
+                print(f"{t.calls:>10} {ms(t.own)} {ms(t.total)}  {fname}:{line}", file=out)
+
+    def collapsed(self, out: TextIO) -> None:
+        # One "a;b;c micwoseconds" wine pew caww chain, what fwamegwaph.pw and speedscope wead
+        for key, ns in sorted(self.stacks.items()):
+            us = ns // 1000
+            if us > 0:
+                print(f"{';'.join(key)} {us}", file=out)
+
+class PwofileRunner(Runner):
+    # The twee engine, but tewwing the pwofiwew about evewy caww and statement
+    pwofiler: Optional[Pwofiler] = None
+
+    def __init__(self, tree: Tree, initSf: StackFrame = None, basedir: str = "", modules: ModuleRegistry = None) -> None:
+        super().__init__(tree, initSf, basedir, modules)
+        self.pwofiler.learn(tree)
+
+    def invoke(self, fdef: FunctionDef, frame: StackFrame, site: Node) -> Optional[Data]:
+        self.pwofiler.call(reconstructNodeName(site))
+        try:
+            return super().invoke(fdef, frame, site)
+        finally:
+            self.pwofiler.done()
+
+    def executeNode(self, node: Node, stack: List[StackFrame] = None) -> Optional[Data]:
+        tally = self.pwofiler.statements.get(id(node))
+        if tally is None:
+            return super().executeNode(node, stack=stack)
+        p = self.pwofiler
+        p.enter(p.running, tally)
+        try:
+            return super().executeNode(node, stack=stack)
+        finally:
+            p.exit(p.running)
+
+    def run(self) -> None:
+        # Each fiwe (the main one and anything woaded) is the bottom of its own stack
+        self.pwofiler.call("<uwu>" if self.code.name is None else os.path.basename(self.code.name))
+        try:
+            return super().run()
+        finally:
+            self.pwofiler.done()
@@ -0,0 +1,54 @@
+
+
+# Gives identifiers a (depth, slot) address when the frame holding them is known before running
+from typing import Dict, List, Optional
+
+from pawser.Pawser import Tree, Node, NodeType
+
+class Scope:
+    # Frames that can gain names while running (globals, cwassu statics) have no slots
+    def __init__(self, names: Optional[List[str]] = None) -> None:
+        self.slots: Optional[Dict[str, int]] = None
+        if names is not None:
+            self.slots = {}
+            for n in names:
+                self.slots.setdefault(n, len(self.slots))
+
+class Resolver:
+    def resolve(self, tree: Tree) -> None:
+        self.walk(tree.base, [ Scope() ])
+        tree.resolved = True
+
+    def bind(self, node: Node, chain: List[Scope]) -> None:
+        for depth, scope in enumerate(reversed(chain)):
+            if scope.slots is None:
+                break
+            if node.data in scope.slots:
+                node.address = (depth, scope.slots[node.data])
+                return
+        node.address = None
+
+    def walk(self, node: Node, chain: List[Scope]) -> None:
+        if node.type == NodeType.IDENTIFIER_EXPR:
+            # Only the first identifier is a vawiable, the rest are possessives
+            self.bind(node.children[0], chain)
+            return
+        if node.type == NodeType.EXPWESSION and node.children[0].type == NodeType.ARGLIST:
+            args = [ a.data for a in node.children[0].children ]
+            self.walk(node.children[1], chain + [ Scope(args) ])
+            return
+        if node.type == NodeType.CLASSDEF:
+            # Cwassu bodies only see the globals of the runner that defines them
+            root = chain[:1]
+            for c in node.children:
+                if c.type == NodeType.MWETHOD:
+                    args = [ a.data for a in c.children[1].children ]
+                    self.walk(c.children[2], root + [ Scope(args + [ "watashi" ]) ])
+                elif c.type == NodeType.NEW:
+                    args = [ a.data for a in c.children[0].children ]
+                    self.walk(c.children[1], root + [ Scope(args + [ "watashi" ]) ])
+                else:
+                    self.walk(c, root + [ Scope() ])
+            return
+        for c in node.children:
+            self.walk(c, chain)
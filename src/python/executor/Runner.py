@@ -1,26 +1,42 @@
 
 
+from array import array
 from enum import Enum
+from functools import reduce
+from itertools import repeat
 import math
+import operator
 import os
-from typing import Any, Dict, List, Optional, Set
+import re
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
-from pawser.Pawser import Tree, Node, NodeType, Pawser, Tokenizer
-from pawser.IStream import Filestream
+from pawser.Pawser import Tree, Node, NodeType
+from executor.Resolver import Resolver
+from executor import Cache
+from executor.Modules import ModuleRegistry
 
 from secrets import randbelow
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 class DataType(Enum):
     NWULL = 0
     BWOOLEAN = 1
     NUMBWER = 2
     STWING = 3
     FWUNCTION = 4
+    AWWAY = 5
+    MWAP = 6
 
     CWASS = 7
     CWASS_INST = 8
     SCOPE = 9
     MWETHOD = 10
+    BUFFEW = 11
+    WOPE = 12
 
     BUILTIN_FWUNCTION = 14
 
@@ -32,7 +48,7 @@ class FunctionDef:
         self.node = n
         self.args = args
 class ClassDef:
-    def __init__(self, s: List["StackFrame"], n: Node, data: Dict[str, "Data"]) -> None:
+    def __init__(self, s: List["StackFrame"], n: Node, data: "StackFrame") -> None:
         self.stack = s
         self.statics = Data(DataType.SCOPE, data)
         self.newConstructor = None
@@ -49,20 +65,70 @@ class ClassDef:
             elif c.type == NodeType.NEW:
                 # Save object for later construction
                 self.newConstructor = c
+        self.tables: Dict[Tuple[int, ...], Tuple[tuple, Dict[str, "Data"]]] = {}
+        # Evewy instance stawts hewe, so the shapes go away wif the cwassu
+        self.shape = Shape({})
+
+    def methodTable(self, methodStack: tuple) -> Dict[str, "Data"]:
+        # Evewy instance buiwt fwom the same extend chain shawes one fwattened tabwe
+        key = tuple([ id(m) for m in methodStack ])
+        entry = self.tables.get(key)
+        if entry is None:
+            flat = {}
+            for methods in methodStack:
+                for ident, method in methods.items():
+                    flat.setdefault(ident, method)
+            entry = (methodStack, flat)
+            self.tables[key] = entry
+        return entry[1]
+
+# Past this many membews (ow twansitions fwom one shape) instances keep theiw own names instead
+MAX_MEMBEWS = 32
+MAX_TWANSITIONS = 64
+# Keys that couwd be wwitten as a possessive, anything ewse is being used wike a mwap
+MEMBEW = re.compile(r"[^\W\d]\w*(?: [^\W\d]\w*)*")
+
+class Shape:
+    # Instances that got the same membews in the same owdew shawe one shape, and onwy keep a wist uv vawues
+    __slots__ = ("names", "transitions", "shared")
+    def __init__(self, names: Dict[str, int], shared: bool = True) -> None:
+        self.names = names
+        self.transitions: Dict[str, "Shape"] = {}
+        self.shared = shared
+    def add(self, ident: str) -> Optional["Shape"]:
+        # Nwone means the twee is big enough awweady and the instance shouwd go its own way
+        shape = self.transitions.get(ident)
+        if shape is None:
+            if len(self.names) >= MAX_MEMBEWS or len(self.transitions) >= MAX_TWANSITIONS:
+                return None
+            names = dict(self.names)
+            names[ident] = len(names)
+            shape = Shape(names)
+            self.transitions[ident] = shape
+        return shape
+    def private(self) -> "Shape":
+        # A shape onwy one instance uses, so new membews go stwaight intwo its names
+        return Shape(dict(self.names), shared=False)
 
 class ClassInstance:
+    __slots__ = ("shape", "values", "methods", "methodStack")
     def __init__(self, prototype: ClassDef, exec: "Runner", args: List["Data"], extL: Set[str] = None) -> None:
         if extL is None:
             extL = set()
+        self.shape = prototype.shape
+        self.values: List[Data] = []
+        self.methodStack = tuple(self.construct(prototype, exec, args, extL))
+        self.methods = prototype.methodTable(self.methodStack)
+    def construct(self, prototype: ClassDef, exec: "Runner", args: List["Data"], extL: Set[str]) -> List[Dict[str, "Data"]]:
+        # Extended cwassus wun theiw constwuctow on this instance too, so thewe's no thwowaway pawent to copy
         extL.add(str(prototype))
-
-        self.members = {}
-        self.methodStack = []
+        methodStack = []
+        self.methods = prototype.methodTable(())
 
         if prototype.newConstructor is not None:
             sf = StackFrame()
             for i, var in enumerate(prototype.newConstructor.children[0].children):
-                sf.set(var.data, args[i] if i < len(args) else Data(DataType.NWULL))
+                sf.set(var.data, args[i] if i < len(args) else Data.nwull)
             sf.set("watashi", Data(DataType.CWASS_INST, self))
             stack = prototype.stack + [sf]
             for node in prototype.newConstructor.children[1].children:
@@ -74,32 +140,84 @@ class ClassInstance:
                     c: ClassDef = dat.value
                     if str(c) in extL:
                         raise RuntimeException("Circuwar Inweritance")
-                    cinst = ClassInstance(c, exec, exprs, extL)
-                    for ms in cinst.methodStack:
-                        self.methodStack.append(ms)
-                    for s in cinst.members:
-                        self.members[s] = cinst.members[s]
+                    methodStack.extend(self.construct(c, exec, exprs, extL))
+                    self.methods = prototype.methodTable(tuple(methodStack))
                 else:
                     exec.executeNode(node, stack=stack)
-            self.methodStack.append(prototype.methods)
-            self.methodStack.reverse()
+            methodStack.append(prototype.methods)
+            methodStack.reverse()
+        return methodStack
     def has(self, ident: str) -> bool:
-        if ident in self.members:
-            return True
-        for methods in self.methodStack:
-            if ident in methods:
-                return True
-        return False
+        return ident in self.shape.names or ident in self.methods
     def get(self, ident: str) -> "Data":
-        if ident in self.members:
-            return self.members[ident]
-        for methods in self.methodStack:
-            if ident in methods:
-                return methods[ident]
-        return Data(DataType.NWULL)
+        i = self.shape.names.get(ident)
+        if i is not None:
+            return self.values[i]
+        return self.methods.get(ident, Data.nwull)
+    def set(self, ident: str, data: "Data") -> None:
+        i = self.shape.names.get(ident)
+        if i is not None:
+            self.values[i] = data
+            return
+        if self.shape.shared:
+            shape = self.shape.add(ident)
+            if shape is not None:
+                self.shape = shape
+                self.values.append(data)
+                return
+            self.shape = self.shape.private()
+        self.shape.names[ident] = len(self.values)
+        self.values.append(data)
+    def store(self, ident: str, data: "Data") -> None:
+        # Fow update index, keys that awen't membew names mean this instance is a mwap now
+        if self.shape.shared and ident not in self.shape.names and not MEMBEW.fullmatch(ident):
+            self.shape = self.shape.private()
+        self.set(ident, data)
+    def items(self) -> List[Tuple[str, "Data"]]:
+        return [ (k, self.values[i]) for k, i in self.shape.names.items() ]
     def __repr__(self) -> str:
-        return "Class Instance: \nScope: " + ', '.join([ m for m in self.members ]) + "\n" + \
-            '\n'.join(["Method Stack:"] + [', '.join([ m for m in M ]) for M in self.methodStack])
+        return "Class Instance: \nScope: " + ', '.join([ m for m in self.shape.names ]) + "\n" + \
+            "Methods: " + ', '.join([ m for m in self.methods ])
+
+HASHABLE = (DataType.NWULL, DataType.BWOOLEAN, DataType.NUMBWER, DataType.STWING)
+
+class Mwap:
+    # Keys hash on theiw (taipu, vawue) so 1 and *1* awe diffewent keys
+    def __init__(self) -> None:
+        self.entries: Dict[Tuple[DataType, Any], Tuple["Data", "Data"]] = {}
+    @staticmethod
+    def key(d: "Data") -> Tuple[DataType, Any]:
+        if d.taipu in HASHABLE:
+            return (d.taipu, d.value)
+        return (d.taipu, id(d.value))
+    def has(self, key: "Data") -> bool:
+        return Mwap.key(key) in self.entries
+    def get(self, key: "Data") -> "Data":
+        entry = self.entries.get(Mwap.key(key))
+        return Data.nwull if entry is None else entry[1]
+    def put(self, key: "Data", data: "Data") -> None:
+        self.entries[Mwap.key(key)] = (key, data)
+    def delete(self, key: "Data") -> "Data":
+        entry = self.entries.pop(Mwap.key(key), None)
+        return Data.nwull if entry is None else entry[1]
+    def keys(self) -> List["Data"]:
+        return [ k for k, _ in self.entries.values() ]
+    def set(self, ident: str, data: "Data") -> None:
+        self.put(Data(DataType.STWING, ident), data)
+
+class Wope:
+    # A stwing buiwt up in pieces that onwy gets joined when someone needs the whole thing
+    def __init__(self) -> None:
+        self.parts: List[str] = []
+        self.size = 0
+    def add(self, s: str) -> None:
+        self.parts.append(s)
+        self.size += len(s)
+    def flatten(self) -> str:
+        # Keeps the joined stwing as the onwy piece so it's nevew joined twice
+        if len(self.parts) != 1:
+            self.parts = [ ''.join(self.parts) ]
+        return self.parts[0]
 
 def toArglistStr(args: List[str]):
     if len(args) == 0:
@@ -111,45 +229,82 @@ def toArglistStr(args: List[str]):
     else:
         return ' and '.join(args)
 
+class Discard:
+    # Whewe assignments to a possessive uv nwull go
+    def set(self, ident: str, data: "Data") -> None:
+        pass
+DISCARD = Discard()
+
 class Data:
+    __slots__ = ("taipu", "value")
+
+    # Data is nevew changed once made, so vawues can be shawed fweewy
     def __init__(self, type: DataType, value: Any = None) -> None:
         self.taipu = type
         self.value = value
     @staticmethod
+    def bwoolean(value: bool) -> "Data":
+        return Data.twue if value else Data.fawse
+    @staticmethod
     def buildClassDef(node: Node, exec: "Runner") -> None:
         assert node.type == NodeType.CLASSDEF
         sf = StackFrame()
         for c in node.children:
             if c.type != NodeType.MWETHOD and c.type != NodeType.NEW:
                 exec.executeNode(c, stack=exec.stack + [sf])
-        return Data(DataType.CWASS, ClassDef(exec.stack[:], node, sf.data))
+        return Data(DataType.CWASS, ClassDef(exec.stack[:], node, sf))
     @staticmethod
     def instantiate(cwass: "Data", exec: "Runner", args: List["Data"]) -> None:
         if cwass.taipu != DataType.CWASS:
             raise RuntimeException(f"Cannot instantiate {cwass.taipu.name}")
         return Data(DataType.CWASS_INST, ClassInstance(cwass.value, exec, args))
-    def update(self, type: DataType, value: Any = None) -> None:
-        self.taipu = type
-        self.value = value
+    def getTarget(self, node: Node, ident: str) -> Any:
+        # The thing that howds ident, fow assigning to it
+        if self.taipu == DataType.NWULL:
+            return DISCARD
+        if self.taipu == DataType.MWAP:
+            return self.value
+        if self.taipu == DataType.CWASS:
+            c: ClassDef = self.value
+            return c.statics.getTarget(node, ident)
+        if self.taipu == DataType.CWASS_INST:
+            c: ClassInstance = self.value
+            if not c.has(ident):
+                c.set(ident, Data.nwull)
+            return c
+        if self.taipu == DataType.SCOPE:
+            sf: StackFrame = self.value
+            if not sf.has(ident):
+                sf.set(ident, Data.nwull)
+            return sf
+        raise RuntimeException(node, f"Cannot get possessive of {self.taipu}")
     def getPossessive(self, node: Node, ident: str, create: bool = False) -> "Data":
         if self.taipu == DataType.NWULL:
-            return Data(DataType.NWULL)
+            return Data.nwull
+        if self.taipu == DataType.MWAP:
+            m: Mwap = self.value
+            return m.get(Data(DataType.STWING, ident))
         if self.taipu == DataType.CWASS:
             c: ClassDef = self.value
             return c.statics.getPossessive(node, ident, create=create)
         if self.taipu == DataType.CWASS_INST:
             c: ClassInstance = self.value
-            if not c.has(ident):
-                if not create:
-                    return Data(DataType.NWULL)
-                c.members[ident] = Data(DataType.NWULL)
-            return c.get(ident)
+            i = c.shape.names.get(ident)
+            if i is not None:
+                return c.values[i]
+            d = c.methods.get(ident)
+            if d is None:
+                if create:
+                    c.set(ident, Data.nwull)
+                return Data.nwull
+            return d
         if self.taipu == DataType.SCOPE:
-            if ident not in self.value:
+            sf: StackFrame = self.value
+            if not sf.has(ident):
                 if not create:
-                    return Data(DataType.NWULL)
-                self.value[ident] = Data(DataType.NWULL)
-            return self.value[ident]
+                    return Data.nwull
+                sf.set(ident, Data.nwull)
+            return sf.get(ident)
         raise RuntimeException(node, f"Cannot get possessive of {self.taipu}")
     def __str__(self) -> str:
         if self.taipu == DataType.NWULL:
@@ -170,7 +325,7 @@ class Data:
             return "mwethod " + toArglistStr(F.args)
         if self.taipu == DataType.CWASS:
             c: ClassDef = self.value
-            s = [ f"{key}: {c.statics.value[key]}" for key in c.statics.value ]
+            s = [ f"{key}: {val}" for key, val in c.statics.value.items() ]
                 #+ [ f"{n.children[0].data} {toArglistStr([ a.data for a in n.children[1].children ])}" for n in c.node.children if n.type == NodeType.MWETHOD ]
             return 'cwassu { ' + ', '.join(s) + ' }'
         if self.taipu == DataType.CWASS_INST:
@@ -179,19 +334,87 @@ class Data:
                     return "cwassu"
                 return str(d)
             c: ClassInstance = self.value
-            return '{ ' + ', '.join([ f"{k}: {procVal(c.members[k])}" for k in c.members ]) + ' }'
+            return '{ ' + ', '.join([ f"{k}: {procVal(v)}" for k, v in c.items() ]) + ' }'
+        if self.taipu == DataType.AWWAY:
+            def procVal(d: Data):
+                if d.taipu == DataType.CWASS_INST:
+                    return "cwassu"
+                if d.taipu == DataType.AWWAY or d.taipu == DataType.MWAP:
+                    return d.taipu.name.lower()
+                return str(d)
+            return '[ ' + ', '.join([ procVal(d) for d in self.value ]) + ' ]'
+        if self.taipu == DataType.MWAP:
+            def procVal(d: Data):
+                if d.taipu == DataType.CWASS_INST:
+                    return "cwassu"
+                if d.taipu == DataType.AWWAY or d.taipu == DataType.MWAP:
+                    return d.taipu.name.lower()
+                return str(d)
+            m: Mwap = self.value
+            return '{ ' + ', '.join([ f"{procVal(k)}: {procVal(v)}" for k, v in m.entries.values() ]) + ' }'
+        if self.taipu == DataType.WOPE:
+            return self.value.flatten()
+        if self.taipu == DataType.BUFFEW:
+            return 'buffew [ ' + ', '.join([ str(Data(DataType.NUMBWER, v)) for v in self.value ]) + ' ]'
         if self.taipu == DataType.SCOPE:
             def procVal(d: Data):
                 if d.taipu == DataType.CWASS_INST:
                     return "cwassu"
                 return str(d)
-            s: dict = self.value
-            return '{ ' + ', '.join([ f"{k}: {procVal(s[k])}" for k in s ]) + ' }'
+            sf: StackFrame = self.value
+            return '{ ' + ', '.join([ f"{k}: {procVal(v)}" for k, v in sf.items() ]) + ' }'
         return "BUILTIN"
     def __repr__(self) -> str:
         return self.__str__()
+Data.nwull = Data(DataType.NWULL)
+Data.twue = Data(DataType.BWOOLEAN, True)
+Data.fawse = Data(DataType.BWOOLEAN, False)
+
+def constant(node: Node) -> Data:
+    # Witewaws get theiw Data made once and kept on the node
+    d = node.value
+    if d is None:
+        if node.type == NodeType.CONST_NWULL:
+            d = Data.nwull
+        elif node.type == NodeType.CONST_BWOOLEAN:
+            d = Data.bwoolean(node.data)
+        elif node.type == NodeType.CONST_NUMBWER:
+            d = Data(DataType.NUMBWER, node.data)
+        else:
+            d = Data(DataType.STWING, node.data)
+        node.value = d
+    return d
+
+def toIndex(index: Data, size: int) -> Optional[int]:
+    # Onwy whowe numbwers fwom 0 up to size count as awway indices
+    if index.taipu != DataType.NUMBWER or not float(index.value).is_integer():
+        return None
+    i = int(index.value)
+    if 0 <= i <= size:
+        return i
+    return None
+
+def callee(parent: Data, node: Node) -> Data:
+    # Caww sites wemembew the wast method tabwe they wooked in, so the same cwassu skips the wookup
+    if parent.taipu == DataType.CWASS_INST:
+        c: ClassInstance = parent.value
+        i = c.shape.names.get(node.data)
+        if i is not None:
+            return c.values[i]
+        cache = node.value
+        if cache is not None and cache[0] is c.methods:
+            return cache[1]
+        d = c.methods.get(node.data)
+        if d is None:
+            return Data.nwull
+        node.value = (c.methods, d)
+        return d
+    return parent.getPossessive(node, node.data)
 
 class BuiltinFwunction:
+    # Buiwtins that can take two awgs wifout a wist ovewwide this, engines use it fow 2 awg cawws
+    binary = None
+
     def call(self, node: Node, args: List[Data]) -> Data:
         raise NotImplementedError()
 class BuiltinNaryFwunction(BuiltinFwunction):
@@ -219,7 +442,7 @@ class BuiltinNumbwerFwunction(BuiltinFwunction):
         if self.maxArg >= 0 and len(args) > self.maxArg:
             raise RuntimeException(node, f"Expwected {self.maxArg} args, got {len(args)}")
         if any(a.taipu != DataType.NUMBWER for a in args):
-            return Data(DataType.NWULL)
+            return Data.nwull
         return self.evaluate(node, [ a.value for a in args ])
     def evaluate(self, node: Node, args: List[float]) -> Data:
         raise NotImplementedError()
@@ -232,7 +455,7 @@ class BuiltinBinawyUnawyFwunction(BuiltinNumbwerFwunction):
 class BUILTIN_PWINT(BuiltinFwunction):
     def call(self, node: Node, args: List[Data]) -> Data:
         print(' '.join([ str(a) for a in args ]))
-        return Data(DataType.NWULL)
+        return Data.nwull
 class BUILTIN_INPUT(BuiltinFwunction):
     def call(self, node: Node, args: List[Data]) -> Data:
         return Data(DataType.STWING, input(' '.join([ str(a) for a in args ])))
@@ -242,11 +465,17 @@ class BUILTIN_NUM_INPUT(BuiltinFwunction):
         try:
             return Data(DataType.NUMBWER, float(n))
         except ValueError:
-            return Data(DataType.NWULL)
+            return Data.nwull
 class BUILTIN_JOIN(BuiltinNaryFwunction):
     def __init__(self) -> None:
         super().__init__(1)
     def call(self, node: Node, args: List[Data]) -> Data:
+        if len(args) > 0 and args[0].taipu == DataType.WOPE:
+            # Adds onto the wope in pwace instead uv copying evewything so faw
+            w: Wope = args[0].value
+            for a in args[1:]:
+                w.add(str(a))
+            return args[0]
         return Data(DataType.STWING, ''.join([ str(a) for a in args ]))
 class BUILTIN_STWING(BuiltinBinawyUnawyFwunction):
     def call(self, node: Node, args: List[Data]) -> Data:
@@ -255,41 +484,71 @@ class BUILTIN_NWUMBER(BuiltinBinawyUnawyFwunction):
     def call(self, node: Node, args: List[Data]) -> Data:
         d = args[0]
         if d.taipu == DataType.NUMBWER:
-            return Data(d.taipu, d.value)
+            return d
         if d.taipu == DataType.STWING:
             try:
                 return Data(d.taipu, float(d.value))
             except ValueError:
                 pass
-        return Data(DataType.NWULL)
+        return Data.nwull
 class BUILTIN_SUM(BuiltinNumbwerFwunction):
+    def call(self, node: Node, args: List[Data]) -> Data:
+        if len(args) == 1 and args[0].taipu == DataType.BUFFEW:
+            return Data(DataType.NUMBWER, reduce(operator.add, args[0].value, 0.0))
+        return super().call(node, args)
     def evaluate(self, node: Node, args: List[float]) -> Data:
         s = 0.0
         for a in args:
             s += a
         return Data(DataType.NUMBWER, s)
+    def binary(self, a: Data, b: Data) -> Data:
+        if a.taipu != DataType.NUMBWER or b.taipu != DataType.NUMBWER:
+            return Data.nwull
+        return Data(DataType.NUMBWER, 0.0 + a.value + b.value)
 class BUILTIN_PRODUCT(BuiltinNumbwerFwunction):
+    def call(self, node: Node, args: List[Data]) -> Data:
+        if len(args) == 1 and args[0].taipu == DataType.BUFFEW:
+            return Data(DataType.NUMBWER, reduce(operator.mul, args[0].value, 1.0))
+        return super().call(node, args)
     def evaluate(self, node: Node, args: List[float]) -> Data:
         p = 1.0
         for a in args:
             p *= a
         return Data(DataType.NUMBWER, p)
+    def binary(self, a: Data, b: Data) -> Data:
+        if a.taipu != DataType.NUMBWER or b.taipu != DataType.NUMBWER:
+            return Data.nwull
+        return Data(DataType.NUMBWER, 1.0 * a.value * b.value)
 class BUILTIN_DIFF(BuiltinBinawyNumbwerFwunction):
     def evaluate(self, node: Node, args: List[float]) -> Data:
         return Data(DataType.NUMBWER, args[0] - args[1])
+    def binary(self, a: Data, b: Data) -> Data:
+        if a.taipu != DataType.NUMBWER or b.taipu != DataType.NUMBWER:
+            return Data.nwull
+        return Data(DataType.NUMBWER, a.value - b.value)
 class BUILTIN_DIWISION(BuiltinBinawyNumbwerFwunction):
     def evaluate(self, node: Node, args: List[float]) -> Data:
         if args[1] == 0.0:
             if args[0] > 0:
-                return math.inf
+                return Data(DataType.NUMBWER, math.inf)
             elif args[0] < 0:
-                return -math.inf
+                return Data(DataType.NUMBWER, -math.inf)
             else:
-                return 0.0
+                return Data(DataType.NUMBWER, 0.0)
         return Data(DataType.NUMBWER, args[0] / args[1])
+    def binary(self, a: Data, b: Data) -> Data:
+        if a.taipu != DataType.NUMBWER or b.taipu != DataType.NUMBWER:
+            return Data.nwull
+        if b.value == 0.0:
+            return self.evaluate(None, [ a.value, b.value ])
+        return Data(DataType.NUMBWER, a.value / b.value)
 class BUILTIN_MOD(BuiltinBinawyNumbwerFwunction):
     def evaluate(self, node: Node, args: List[float]) -> Data:
         return Data(DataType.NUMBWER, args[0] % args[1])
+    def binary(self, a: Data, b: Data) -> Data:
+        if a.taipu != DataType.NUMBWER or b.taipu != DataType.NUMBWER:
+            return Data.nwull
+        return Data(DataType.NUMBWER, a.value % b.value)
 class BUILTIN_NEGATIVE(BuiltinBinawyUnawyFwunction):
     def evaluate(self, node: Node, args: List[float]) -> Data:
         return Data(DataType.NUMBWER, -args[0])
@@ -310,65 +569,114 @@ class BUILTIN_SQRT(BuiltinBinawyUnawyFwunction):
         return Data(DataType.NUMBWER, float(math.sqrt(args[0])))
 class BUILTIN_GTR(BuiltinBinawyNumbwerFwunction):
     def evaluate(self, node: Node, args: List[float]) -> Data:
-        return Data(DataType.BWOOLEAN, args[0] > args[1])
+        return Data.bwoolean(args[0] > args[1])
+    def binary(self, a: Data, b: Data) -> Data:
+        if a.taipu != DataType.NUMBWER or b.taipu != DataType.NUMBWER:
+            return Data.nwull
+        return Data.bwoolean(a.value > b.value)
 class BUILTIN_LSS(BuiltinBinawyNumbwerFwunction):
     def evaluate(self, node: Node, args: List[float]) -> Data:
-        return Data(DataType.BWOOLEAN, args[0] < args[1])
+        return Data.bwoolean(args[0] < args[1])
+    def binary(self, a: Data, b: Data) -> Data:
+        if a.taipu != DataType.NUMBWER or b.taipu != DataType.NUMBWER:
+            return Data.nwull
+        return Data.bwoolean(a.value < b.value)
 class BUILTIN_GTREQ(BuiltinBinawyNumbwerFwunction):
     def evaluate(self, node: Node, args: List[float]) -> Data:
-        return Data(DataType.BWOOLEAN, args[0] >= args[1])
+        return Data.bwoolean(args[0] >= args[1])
+    def binary(self, a: Data, b: Data) -> Data:
+        if a.taipu != DataType.NUMBWER or b.taipu != DataType.NUMBWER:
+            return Data.nwull
+        return Data.bwoolean(a.value >= b.value)
 class BUILTIN_LSSEQ(BuiltinBinawyNumbwerFwunction):
     def evaluate(self, node: Node, args: List[float]) -> Data:
-        return Data(DataType.BWOOLEAN, args[0] <= args[1])
+        return Data.bwoolean(args[0] <= args[1])
+    def binary(self, a: Data, b: Data) -> Data:
+        if a.taipu != DataType.NUMBWER or b.taipu != DataType.NUMBWER:
+            return Data.nwull
+        return Data.bwoolean(a.value <= b.value)
+def same(a: Data, b: Data) -> bool:
+    # Pwain vawues compawe by vawue, evewything ewse (awways, buffews, mwaps, wopes, instances)
+    # is onwy the same as itsewf, wike mwap keys
+    if a.taipu != b.taipu:
+        return False
+    if a.taipu in HASHABLE:
+        return a.value == b.value
+    return a.value is b.value
 class BUILTIN_EQ(BuiltinNaryFwunction):
     def __init__(self) -> None:
         super().__init__(2)
     def evaluate(self, node: Node, args: List[Data]) -> Data:
         a = args[0]
         for v in args[1:]:
-            if a.taipu != v.taipu or a.value != v.value:
-                return Data(DataType.BWOOLEAN, False)
-        return Data(DataType.BWOOLEAN, True)
+            if not same(a, v):
+                return Data.bwoolean(False)
+        return Data.bwoolean(True)
+    def binary(self, a: Data, b: Data) -> Data:
+        return Data.bwoolean(same(a, b))
 class BUILTIN_NEQ(BuiltinNaryFwunction):
     def __init__(self) -> None:
         super().__init__(2)
     def evaluate(self, node: Node, args: List[Data]) -> Data:
         a = args[0]
         for v in args[1:]:
-            if a.taipu != v.taipu or a.value != v.value:
-                return Data(DataType.BWOOLEAN, True)
-        return Data(DataType.BWOOLEAN, False)
+            if not same(a, v):
+                return Data.bwoolean(True)
+        return Data.bwoolean(False)
+    def binary(self, a: Data, b: Data) -> Data:
+        return Data.bwoolean(not same(a, b))
 class BUILTIN_AND(BuiltinBinawyFwunction):
     def evaluate(self, node: Node, args: List[Data]) -> Data:
         a = not (args[0].taipu == DataType.NWULL or (args[0].taipu == DataType.BWOOLEAN and not args[0].value))
         b = not (args[1].taipu == DataType.NWULL or (args[1].taipu == DataType.BWOOLEAN and not args[1].value))
-        return Data(DataType.BWOOLEAN, a and b)
+        return Data.bwoolean(a and b)
+    def binary(self, a: Data, b: Data) -> Data:
+        x = not (a.taipu == DataType.NWULL or (a.taipu == DataType.BWOOLEAN and not a.value))
+        y = not (b.taipu == DataType.NWULL or (b.taipu == DataType.BWOOLEAN and not b.value))
+        return Data.bwoolean(x and y)
 class BUILTIN_OR(BuiltinBinawyFwunction):
     def evaluate(self, node: Node, args: List[Data]) -> Data:
         a = not (args[0].taipu == DataType.NWULL or (args[0].taipu == DataType.BWOOLEAN and not args[0].value))
         b = not (args[1].taipu == DataType.NWULL or (args[1].taipu == DataType.BWOOLEAN and not args[1].value))
-        return Data(DataType.BWOOLEAN, a or b)
+        return Data.bwoolean(a or b)
+    def binary(self, a: Data, b: Data) -> Data:
+        x = not (a.taipu == DataType.NWULL or (a.taipu == DataType.BWOOLEAN and not a.value))
+        y = not (b.taipu == DataType.NWULL or (b.taipu == DataType.BWOOLEAN and not b.value))
+        return Data.bwoolean(x or y)
 class BUILTIN_NOR(BuiltinBinawyFwunction):
     def evaluate(self, node: Node, args: List[Data]) -> Data:
         a = not (args[0].taipu == DataType.NWULL or (args[0].taipu == DataType.BWOOLEAN and not args[0].value))
         b = not (args[1].taipu == DataType.NWULL or (args[1].taipu == DataType.BWOOLEAN and not args[1].value))
-        return Data(DataType.BWOOLEAN, not (a or b))
+        return Data.bwoolean(not (a or b))
+    def binary(self, a: Data, b: Data) -> Data:
+        x = not (a.taipu == DataType.NWULL or (a.taipu == DataType.BWOOLEAN and not a.value))
+        y = not (b.taipu == DataType.NWULL or (b.taipu == DataType.BWOOLEAN and not b.value))
+        return Data.bwoolean(not (x or y))
 class BUILTIN_ANY(BuiltinNaryFwunction):
     def evaluate(self, node: Node, args: List[Data]) -> Data:
         bwools = [ not (a.taipu == DataType.NWULL or (a.taipu == DataType.BWOOLEAN and not a.value)) for a in args ]
-        return Data(DataType.BWOOLEAN, any(bwools))
+        return Data.bwoolean(any(bwools))
 class BUILTIN_ALL(BuiltinNaryFwunction):
     def evaluate(self, node: Node, args: List[Data]) -> Data:
         bwools = [ not (a.taipu == DataType.NWULL or (a.taipu == DataType.BWOOLEAN and not a.value)) for a in args ]
-        return Data(DataType.BWOOLEAN, all(bwools))
+        return Data.bwoolean(all(bwools))
 class BUILTIN_INDEX(BuiltinNaryFwunction):
     def __init__(self) -> None:
         super().__init__(2, 2)
     def evaluate(self, node: Node, args: List[Data]) -> Data:
         table = args[0]
         index = args[1]
+        if table.taipu == DataType.MWAP:
+            # Nwull is a key wike any othew in a mwap
+            return table.value.get(index)
         if table.taipu == DataType.NWULL or index.taipu == DataType.NWULL:
-            return Data(DataType.NWULL)
+            return Data.nwull
+        if table.taipu == DataType.AWWAY:
+            i = toIndex(index, len(table.value) - 1)
+            return Data.nwull if i is None else table.value[i]
+        if table.taipu == DataType.BUFFEW:
+            i = toIndex(index, len(table.value) - 1)
+            return Data.nwull if i is None else Data(DataType.NUMBWER, table.value[i])
         indexS = str(index)
         return table.getPossessive(node, indexS)
 class BUILTIN_SETINDEX(BuiltinNaryFwunction):
@@ -378,40 +686,285 @@ class BUILTIN_SETINDEX(BuiltinNaryFwunction):
         table = args[0]
         index = args[1]
         value = args[2]
+        if table.taipu == DataType.MWAP:
+            table.value.put(index, value)
+            return Data.nwull
         if table.taipu == DataType.NWULL or index.taipu == DataType.NWULL:
-            return Data(DataType.NWULL)
+            return Data.nwull
+        if table.taipu == DataType.AWWAY:
+            items: List[Data] = table.value
+            i = toIndex(index, len(items))
+            if i == len(items):
+                items.append(value)
+            elif i is not None:
+                items[i] = value
+            return Data.nwull
+        if table.taipu == DataType.BUFFEW:
+            if value.taipu != DataType.NUMBWER:
+                return Data.nwull
+            nums: array = table.value
+            i = toIndex(index, len(nums))
+            if i == len(nums):
+                nums.append(value.value)
+            elif i is not None:
+                nums[i] = value.value
+            return Data.nwull
         indexS = str(index)
-        dat = table.getPossessive(node, indexS, True)
-        dat.update(value.taipu, value.value)
-        return Data(DataType.NWULL)
+        if table.taipu == DataType.CWASS_INST:
+            table.value.store(indexS, value)
+            return Data.nwull
+        table.getTarget(node, indexS).set(indexS, value)
+        return Data.nwull
 class BUILTIN_SUBSTR(BuiltinNaryFwunction):
     def __init__(self) -> None:
         super().__init__(2,3)
     def evaluate(self, node: Node, args: List[Data]) -> Data:
+        if args[0].taipu == DataType.AWWAY or args[0].taipu == DataType.BUFFEW:
+            return self.swice(args)
         if len(args) == 3:
             string = args[0]
             start = args[1]
             end = args[2]
             if string.taipu == DataType.NWULL or start.taipu != DataType.NUMBWER or end.taipu != DataType.NUMBWER:
-                return Data(DataType.NWULL)
+                return Data.nwull
         else:
             string = args[0]
             start = args[1]
             if string.taipu == DataType.NWULL or start.taipu != DataType.NUMBWER:
-                return Data(DataType.NWULL)
+                return Data.nwull
             end = Data(DataType.NUMBWER, start.value + 1)
-        sval = str(string)
+        sval = string.value if string.taipu == DataType.STWING else str(string)
         si = int(start.value)
         ei = int(end.value)
         if 0 <= si <= len(sval) and 0 <= ei <= len(sval) and si <= ei:
             return Data(DataType.STWING, sval[si:ei])
-        return Data(DataType.NWULL)
+        return Data.nwull
+    def swice(self, args: List[Data]) -> Data:
+        items = args[0].value
+        si = toIndex(args[1], len(items))
+        if si is None:
+            return Data.nwull
+        ei = toIndex(args[2], len(items)) if len(args) == 3 else min(si + 1, len(items))
+        if ei is None or ei < si:
+            return Data.nwull
+        return Data(args[0].taipu, items[si:ei])
 class BUILTIN_STRLEN(BuiltinNaryFwunction):
     def __init__(self) -> None:
         super().__init__(1, 1)
     def evaluate(self, node: Node, args: List[Data]) -> Data:
-        sval = str(args[0])
+        if args[0].taipu == DataType.AWWAY or args[0].taipu == DataType.BUFFEW:
+            return Data(DataType.NUMBWER, len(args[0].value))
+        if args[0].taipu == DataType.MWAP:
+            return Data(DataType.NUMBWER, len(args[0].value.entries))
+        if args[0].taipu == DataType.WOPE:
+            return Data(DataType.NUMBWER, args[0].value.size)
+        sval = args[0].value if args[0].taipu == DataType.STWING else str(args[0])
         return Data(DataType.NUMBWER, len(sval))
+class BUILTIN_AWWAY(BuiltinNaryFwunction):
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        return Data(DataType.AWWAY, list(args))
+class BUILTIN_MWAP(BuiltinNaryFwunction):
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        if len(args) % 2 != 0:
+            return Data.nwull
+        m = Mwap()
+        for i in range(0, len(args), 2):
+            m.put(args[i], args[i + 1])
+        return Data(DataType.MWAP, m)
+class BUILTIN_HAS_KEY(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(2, 2)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        if args[0].taipu != DataType.MWAP:
+            return Data.nwull
+        return Data.bwoolean(args[0].value.has(args[1]))
+class BUILTIN_KEYS(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(1, 1)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        if args[0].taipu != DataType.MWAP:
+            return Data.nwull
+        return Data(DataType.AWWAY, args[0].value.keys())
+class BUILTIN_DELETE(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(2, 2)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        if args[0].taipu != DataType.MWAP:
+            return Data.nwull
+        return args[0].value.delete(args[1])
+class BUILTIN_PWUSH(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(1)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        if args[0].taipu == DataType.AWWAY:
+            args[0].value.extend(args[1:])
+        return Data.nwull
+class BUILTIN_POP(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(1, 1)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        if args[0].taipu != DataType.AWWAY or len(args[0].value) == 0:
+            return Data.nwull
+        return args[0].value.pop()
+class BUILTIN_INSWERT(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(3, 3)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        if args[0].taipu != DataType.AWWAY:
+            return Data.nwull
+        items: List[Data] = args[0].value
+        i = toIndex(args[1], len(items))
+        if i is None:
+            return Data.fawse
+        items.insert(i, args[2])
+        return Data.twue
+class BUILTIN_WEMOVE(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(2, 2)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        if args[0].taipu != DataType.AWWAY:
+            return Data.nwull
+        items: List[Data] = args[0].value
+        i = toIndex(args[1], len(items) - 1)
+        if i is None:
+            return Data.nwull
+        return items.pop(i)
+def numbwers(args: List[Data]) -> Optional[array]:
+    # Fwattens numbwers, awways and buffews into one packed buffew, ow Nwone if thewe's anything ewse in thewe
+    nums = array('d')
+    for a in args:
+        if a.taipu == DataType.NUMBWER:
+            nums.append(a.value)
+        elif a.taipu == DataType.BUFFEW:
+            nums.extend(a.value)
+        elif a.taipu == DataType.AWWAY:
+            inner = numbwers(a.value)
+            if inner is None:
+                return None
+            nums.extend(inner)
+        else:
+            return None
+    return nums
+def compawe(a: float, b: float) -> int:
+    return (a > b) - (a < b)
+# Numpy gives the same answews fow these since each ewement is just one opewation
+UFUNCS = {} if numpy is None else {
+    operator.add: numpy.add,
+    operator.mul: numpy.multiply,
+    compawe: lambda x, y: (x > y).astype(numpy.float64) - (x < y)
+}
+class BuiltinEachFwunction(BuiltinNaryFwunction):
+    # Wuns op ovew each paiw uv ewements, a numbwew on eithew side is used fow evewy ewement
+    def __init__(self, op: Callable[[float, float], float]) -> None:
+        super().__init__(2, 2)
+        self.op = op
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        a, b = args
+        if a.taipu == DataType.BUFFEW and b.taipu == DataType.BUFFEW:
+            if len(a.value) != len(b.value):
+                return Data.nwull
+            x, y = a.value, b.value
+        elif a.taipu == DataType.BUFFEW and b.taipu == DataType.NUMBWER:
+            x, y = a.value, b.value
+        elif a.taipu == DataType.NUMBWER and b.taipu == DataType.BUFFEW:
+            x, y = a.value, b.value
+        else:
+            return Data.nwull
+        ufunc = UFUNCS.get(self.op)
+        if ufunc is not None:
+            x = numpy.frombuffer(x) if isinstance(x, array) else x
+            y = numpy.frombuffer(y) if isinstance(y, array) else y
+            return Data(DataType.BUFFEW, array('d', ufunc(x, y).tobytes()))
+        if not isinstance(x, array):
+            x = repeat(x)
+        if not isinstance(y, array):
+            y = repeat(y)
+        return Data(DataType.BUFFEW, array('d', map(self.op, x, y)))
+class BUILTIN_BUFFEW(BuiltinNaryFwunction):
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        nums = numbwers(args)
+        return Data.nwull if nums is None else Data(DataType.BUFFEW, nums)
+class BUILTIN_FIWW(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(2, 2)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        if args[1].taipu != DataType.NUMBWER:
+            return Data.nwull
+        if args[0].taipu == DataType.BUFFEW:
+            nums: array = args[0].value
+            nums[:] = array('d', [ args[1].value ]) * len(nums)
+            return args[0]
+        if args[0].taipu != DataType.NUMBWER or args[0].value < 0:
+            return Data.nwull
+        count = args[0].value
+        if not math.isfinite(count) or count != int(count):
+            return Data.nwull
+        return Data(DataType.BUFFEW, array('d', [ args[1].value ]) * int(count))
+class BUILTIN_WANGE(BuiltinNumbwerFwunction):
+    def __init__(self) -> None:
+        super().__init__(1, 3)
+    def evaluate(self, node: Node, args: List[float]) -> Data:
+        start, end, step = (0.0, args[0], 1.0) if len(args) == 1 else (args[0], args[1], args[2] if len(args) == 3 else 1.0)
+        if step == 0 or not all(math.isfinite(a) for a in (start, end, step)):
+            return Data.nwull
+        n = max(0, math.ceil((end - start) / step))
+        return Data(DataType.BUFFEW, array('d', [ start + k * step for k in range(n) ]))
+class BUILTIN_SMOWWEST(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(1)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        nums = numbwers(args)
+        return Data(DataType.NUMBWER, min(nums)) if nums else Data.nwull
+class BUILTIN_BWIGGEST(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(1)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        nums = numbwers(args)
+        return Data(DataType.NUMBWER, max(nums)) if nums else Data.nwull
+class BUILTIN_DOT(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(2, 2)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        a, b = args
+        if a.taipu != DataType.BUFFEW or b.taipu != DataType.BUFFEW:
+            return Data.nwull
+        if len(a.value) != len(b.value):
+            return Data.nwull
+        # Added up in owdew, so it comes out the same as a sum uv pwoducts woop
+        return Data(DataType.NUMBWER, reduce(operator.add, map(operator.mul, a.value, b.value), 0.0))
+class BUILTIN_WOPE(BuiltinNaryFwunction):
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        w = Wope()
+        for a in args:
+            w.add(str(a))
+        return Data(DataType.WOPE, w)
+class BUILTIN_WOPE_ADD(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(1)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        if args[0].taipu != DataType.WOPE:
+            return Data.nwull
+        w: Wope = args[0].value
+        for a in args[1:]:
+            w.add(str(a))
+        return args[0]
+class BUILTIN_WOPE_JOIN(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(2, 3)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        if args[0].taipu != DataType.WOPE:
+            return Data.nwull
+        if args[1].taipu != DataType.AWWAY:
+            return Data.nwull
+        w: Wope = args[0].value
+        sep = str(args[2]) if len(args) == 3 else ""
+        w.add(sep.join([ str(d) for d in args[1].value ]))
+        return args[0]
+class BUILTIN_WOPE_FINISH(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(1, 1)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        return Data(DataType.STWING, str(args[0]))
 class BUILTIN_RAND(BuiltinNumbwerFwunction):
     def __init__(self) -> None:
         super().__init__(0, 2)
@@ -430,16 +983,24 @@ class BUILTIN_RAND(BuiltinNumbwerFwunction):
 
 class StackFrame:
     def __init__(self) -> None:
-        self.data: Dict[str, Data] = {}
+        self.names: Dict[str, int] = {}
+        self.slots: List[Data] = []
     def has(self, ident: str):
-        return ident in self.data
+        return ident in self.names
     def get(self, ident: str):
-        return self.data[ident]
+        return self.slots[self.names[ident]]
     def set(self, ident: str, data: Data):
-        self.data[ident] = data
+        i = self.names.get(ident)
+        if i is None:
+            self.names[ident] = len(self.slots)
+            self.slots.append(data)
+        else:
+            self.slots[i] = data
+    def items(self) -> List[Tuple[str, Data]]:
+        return [ (k, self.slots[i]) for k, i in self.names.items() ]
     
     def __repr__(self) -> str:
-        return "StackFrame(" + ','.join([ f"{k}: {self.data[k]}" for k in self.data ]) + ")"
+        return "StackFrame(" + ','.join([ f"{k}: {v}" for k, v in self.items() ]) + ")"
 
 def reconstructNodeName(n: Node):
     if n.type == NodeType.IDENTIFIER_EXPR:
@@ -448,27 +1009,55 @@ def reconstructNodeName(n: Node):
             s += "'s " + n2.data
         return s
 
+class CallSite:
+    # One wink uv an ewwow's twaceback, pointing at the caww it came thwough befowe this one
+    __slots__ = ("node", "inner")
+    def __init__(self, node: Node, inner: Optional["CallSite"]) -> None:
+        self.node = node
+        self.inner = inner
+
 class RuntimeException(Exception):
     def __init__(self, node: Node, s: str, returnStack: List[Node] = None) -> None:
-        if returnStack is None:
-            returnStack = []
+        super().__init__(s)
         self.node = node
         self.err = s
-        self.returnStack = returnStack
-        self.lines = []
-        for r in self.returnStack:
-            s2 = reconstructNodeName(r)
-            self.lines.append(f"    cawled at {s2} on wine {r.line}")
-        super().__init__('\n'.join([f"Oh Nyo! Pwogwam ewwow on wine {node.line}! {s}   ┐('～`;)┌"] + self.lines))
+        self.trace: Optional[CallSite] = None
+        if returnStack is not None:
+            for r in returnStack:
+                self.calledAt(r)
+    def calledAt(self, site: Node) -> "RuntimeException":
+        # Cheap enough to do at evewy fwame on the way out, nothing is fowmatted untiw it's pwinted
+        self.trace = CallSite(site, self.trace)
+        return self
+    @property
+    def returnStack(self) -> List[Node]:
+        sites = []
+        t = self.trace
+        while t is not None:
+            sites.append(t.node)
+            t = t.inner
+        sites.reverse()
+        return sites
+    @property
+    def lines(self) -> List[str]:
+        return [ f"    cawled at {reconstructNodeName(r)} on wine {r.line}" for r in self.returnStack ]
+    def __str__(self) -> str:
+        return '\n'.join([f"Oh Nyo! Pwogwam ewwow on wine {self.node.line}! {self.err}   ┐('～`;)┌"] + self.lines)
 
 class Runner:
-    def __init__(self, tree: Tree, initSf: StackFrame = None, basedir: str = "") -> None:
+    # Set to an Optimizer to have evewy twee it wuns (moduwes too) optimized fiwst
+    optimizer = None
+
+    def __init__(self, tree: Tree, initSf: StackFrame = None, basedir: str = "", modules: ModuleRegistry = None) -> None:
         if basedir == "":
             self.basedir = os.getcwd()
         else:
             self.basedir = basedir
+        self.modules = ModuleRegistry() if modules is None else modules
 
         self.code = tree
+        if not tree.resolved:
+            Resolver().resolve(tree)
 
         self.stack: List[StackFrame] = [  ]
         self.globals = initSf
@@ -514,19 +1103,51 @@ class Runner:
             self.globals.set("subby", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_SUBSTR()))
             self.globals.set("length", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_STRLEN()))
 
+            self.globals.set("awway", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_AWWAY()))
+            self.globals.set("pwush", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_PWUSH()))
+            self.globals.set("pop", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_POP()))
+            self.globals.set("inswert", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_INSWERT()))
+            self.globals.set("wemove", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_WEMOVE()))
+
+            self.globals.set("mwap", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_MWAP()))
+            self.globals.set("has key", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_HAS_KEY()))
+            self.globals.set("keys", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_KEYS()))
+            self.globals.set("delete", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_DELETE()))
+
+            self.globals.set("buffew", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_BUFFEW()))
+            self.globals.set("fiww", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_FIWW()))
+            self.globals.set("wange", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_WANGE()))
+            self.globals.set("add each", Data(DataType.BUILTIN_FWUNCTION, BuiltinEachFwunction(operator.add)))
+            self.globals.set("muwtipwy each", Data(DataType.BUILTIN_FWUNCTION, BuiltinEachFwunction(operator.mul)))
+            self.globals.set("compawe each", Data(DataType.BUILTIN_FWUNCTION, BuiltinEachFwunction(compawe)))
+            self.globals.set("smowwest", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_SMOWWEST()))
+            self.globals.set("bwiggest", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_BWIGGEST()))
+            self.globals.set("dot", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_DOT()))
+
+            self.globals.set("wope", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_WOPE()))
+            self.globals.set("wope add", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_WOPE_ADD()))
+            self.globals.set("wope join", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_WOPE_JOIN()))
+            self.globals.set("finish wope", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_WOPE_FINISH()))
+
             self.globals.set("random", Data(DataType.BUILTIN_FWUNCTION, BUILTIN_RAND()))
         
         self.stack.append(self.globals)
 
+        if self.optimizer is not None and not tree.optimized:
+            self.optimizer.optimize(tree, self.globals)
+
     def getData(self, node: Node, ident: str, stack: List[StackFrame] = None, create: bool = False) -> Data:
         if stack is None:
             stack = self.stack
+        if node.address is not None:
+            depth, slot = node.address
+            return stack[-1 - depth].slots[slot]
         # Go through the function stack to find the data
         for frame in reversed(stack):
             if frame.has(ident):
                 return frame.get(ident)
         if create:
-            d = Data(DataType.NWULL)
+            d = Data.nwull
             stack[-1].set(ident, d)
             return d
         raise RuntimeException(node, f"Could not find {ident}")
@@ -535,41 +1156,32 @@ class Runner:
         assert node.type == NodeType.EXPWESSION
 
         expr = node.children[0]
-        if expr.type == NodeType.CONST_NWULL:
-            return Data(DataType.NWULL)
-        if expr.type == NodeType.CONST_NUMBWER:
-            return Data(DataType.NUMBWER, expr.data)
-        if expr.type == NodeType.CONST_BWOOLEAN:
-            return Data(DataType.BWOOLEAN, expr.data)
-        if expr.type == NodeType.CONST_STWING:
-            return Data(DataType.STWING, expr.data)
+        if expr.type == NodeType.CONST_NWULL or expr.type == NodeType.CONST_NUMBWER or expr.type == NodeType.CONST_BWOOLEAN or expr.type == NodeType.CONST_STWING:
+            return constant(expr)
         if expr.type == NodeType.IDENTIFIER_EXPR:
             data, parent = self.getIdentDataFromExpr(expr, stack=stack)
             if len(node.children) == 2 and node.children[1].type == NodeType.FCALL:
-                exprs = [ self.getDataFromExpr(n, stack=stack) for n in node.children[1].children[0].children ]
+                argNodes = node.children[1].children[0].children
+                if len(argNodes) == 2 and data.taipu == DataType.BUILTIN_FWUNCTION and data.value.binary is not None:
+                    return data.value.binary(self.getDataFromExpr(argNodes[0], stack=stack), self.getDataFromExpr(argNodes[1], stack=stack))
+                exprs = [ self.getDataFromExpr(n, stack=stack) for n in argNodes ]
                 if data.taipu == DataType.BUILTIN_FWUNCTION:
                     return data.value.call(node, exprs)
                 elif data.taipu == DataType.FWUNCTION:
                     fdef: FunctionDef = data.value
                     frame = StackFrame()
                     for i, var in enumerate(fdef.args):
-                        frame.set(var, exprs[i] if i < len(exprs) else Data(DataType.NWULL))
-                    try:
-                        return self.executeNode(fdef.node, stack=fdef.stack + [frame])
-                    except RuntimeException as re:
-                        raise RuntimeException(re.node, re.err, re.returnStack + [expr])
+                        frame.set(var, exprs[i] if i < len(exprs) else Data.nwull)
+                    return self.invoke(fdef, frame, expr)
                 elif data.taipu == DataType.CWASS:
                     return Data.instantiate(data, self, exprs)
                 elif data.taipu == DataType.MWETHOD:
                     fdef: FunctionDef = data.value
                     frame = StackFrame()
                     for i, var in enumerate(fdef.args):
-                        frame.set(var, exprs[i] if i < len(exprs) else Data(DataType.NWULL))
+                        frame.set(var, exprs[i] if i < len(exprs) else Data.nwull)
                     frame.set("watashi", Data(DataType.CWASS_INST, parent.value))
-                    try:
-                        return self.executeNode(fdef.node, stack=fdef.stack + [frame])
-                    except RuntimeException as re:
-                        raise RuntimeException(re.node, re.err, re.returnStack + [expr])
+                    return self.invoke(fdef, frame, expr)
                 else:
                     raise RuntimeException(node, f"Cannot cawl vawiable uv taipu {data.taipu}")
             else:
@@ -584,11 +1196,14 @@ class Runner:
             current = None
             parent = None
             isWatashi = False
+            last = node.children[-1]
             for n in node.children:
                 isWatashi = n.data == "watashi"
                 parent = current
                 if current is None:
                     current = self.getData(n, n.data, stack=stack, create=create)
+                elif n is last and not create:
+                    current = callee(current, n)
                 else:
                     current = current.getPossessive(n, n.data, create=create)
                     if current is None:
@@ -603,13 +1218,41 @@ class Runner:
                 raise RuntimeException(node, f"Cwould not fwind {paf}")
             return current, parent
 
+    def getFrame(self, node: Node, stack: List[StackFrame] = None) -> StackFrame:
+        if stack is None:
+            stack = self.stack
+        if node.address is not None:
+            return stack[-1 - node.address[0]]
+        for frame in reversed(stack):
+            if frame.has(node.data):
+                return frame
+        stack[-1].set(node.data, Data.nwull)
+        return stack[-1]
+
+    def getTarget(self, node: Node, stack: List[StackFrame] = None) -> Tuple[Any, str]:
+        # Finds (ow makes) whewe a SET stowes its vawue, befowe the vawue is wowked out
+        parts = node.children
+        if parts[-1].data == "watashi":
+            self.getIdentDataFromExpr(node, stack=stack, create=True)
+        if len(parts) == 1:
+            return self.getFrame(parts[0], stack=stack), parts[0].data
+        current = self.getData(parts[0], parts[0].data, stack=stack, create=True)
+        for n in parts[1:-1]:
+            current = current.getPossessive(n, n.data, create=True)
+        return current.getTarget(parts[-1], parts[-1].data), parts[-1].data
+
+    def invoke(self, fdef: FunctionDef, frame: StackFrame, site: Node) -> Optional[Data]:
+        # Wuns a fwunction ow mwethod body, site is the identifiew it was cawwed thwough
+        try:
+            return self.executeNode(fdef.node, stack=fdef.stack + [frame])
+        except RuntimeException as re:
+            raise re.calledAt(site)
+
     def executeNode(self, node: Node, stack: List[StackFrame] = None) -> Optional[Data]:
         if node.type == NodeType.SET:
-            val,_ = self.getIdentDataFromExpr(node.children[0], stack=stack, create=True)
+            target, ident = self.getTarget(node.children[0], stack=stack)
             dat = self.getDataFromExpr(node.children[1], stack=stack)
-            if dat is None:
-                dat = Data(DataType.NWULL)
-            val.update(dat.taipu, dat.value)
+            target.set(ident, Data.nwull if dat is None else dat)
             return
         if node.type == NodeType.CAWL:
             F,parent = self.getIdentDataFromExpr(node.children[0], require=True, stack=stack)
@@ -622,21 +1265,15 @@ class Runner:
                 fdef: FunctionDef = F.value
                 frame = StackFrame()
                 for i, var in enumerate(fdef.args):
-                    frame.set(var, exprs[i] if i < len(exprs) else Data(DataType.NWULL))
-                try:
-                    self.executeNode(fdef.node, stack=fdef.stack + [frame])
-                except RuntimeException as re:
-                    raise RuntimeException(re.node, re.err, re.returnStack + [node.children[0]])
+                    frame.set(var, exprs[i] if i < len(exprs) else Data.nwull)
+                self.invoke(fdef, frame, node.children[0])
             elif F.taipu == DataType.MWETHOD:
                 fdef: FunctionDef = F.value
                 frame = StackFrame()
                 for i, var in enumerate(fdef.args):
-                    frame.set(var, exprs[i] if i < len(exprs) else Data(DataType.NWULL))
+                    frame.set(var, exprs[i] if i < len(exprs) else Data.nwull)
                 frame.set('watashi', parent)
-                try:
-                    self.executeNode(fdef.node, stack=fdef.stack + [frame])
-                except RuntimeException as re:
-                    raise RuntimeException(re.node, re.err, re.returnStack + [node.children[0]])
+                self.invoke(fdef, frame, node.children[0])
             return
         if node.type == NodeType.FDEF:
             for n in node.children:
@@ -666,35 +1303,73 @@ class Runner:
                                 return Data(DataType.MESSAGE_BWEAK, dat.value - 1)
                             else:
                                 return
+        if node.type == NodeType.COUNT:
+            # A repeat the optimizew found to be a counted woop, the test and step awe done hewe
+            inclusive, step = node.data
+            var = node.children[0].children[0]
+            limit = node.children[1]
+            while True:
+                i = self.getData(var, var.data, stack=stack)
+                n = self.getDataFromExpr(limit, stack=stack)
+                if i.taipu == DataType.NUMBWER and n.taipu == DataType.NUMBWER and (i.value >= n.value if inclusive else i.value > n.value):
+                    return
+                for c in node.children[3:]:
+                    dat = self.executeNode(c, stack=stack)
+                    if dat is not None:
+                        if dat.taipu == DataType.MESSAGE_BWEAK:
+                            if dat.value > 1:
+                                return Data(DataType.MESSAGE_BWEAK, dat.value - 1)
+                            else:
+                                return
+                target, ident = self.getTarget(node.children[2], stack=stack)
+                i = self.getData(var, var.data, stack=stack)
+                target.set(ident, Data(DataType.NUMBWER, 0.0 + i.value + step) if i.taipu == DataType.NUMBWER else Data.nwull)
         if node.type == NodeType.BWEAK:
             return Data(DataType.MESSAGE_BWEAK, node.data)
         if node.type == NodeType.FILE:
             for n in node.children:
-                d = self.executeNode(n)
+                d = self.executeNode(n, stack=self.stack)
                 if d is not None:
                     return d
             return
         if node.type == NodeType.GIVE:
             return self.getDataFromExpr(node.children[0], stack=stack)
         if node.type == NodeType.WOAD:
-            path = str(self.getDataFromExpr(node.children[0], stack=stack))
-            if path.startswith('#'):
-                bd = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-                fpath = os.path.abspath(os.path.join(bd, 'stdlib', path[1:] + '.uwu'))
-            else:
-                fpath = os.path.abspath(os.path.join(self.basedir, path + '.uwu'))
-            parser = Pawser(Tokenizer(Filestream(fpath)))
-            parser.parse_START()
-            exec = Runner(parser.tree, basedir=os.path.dirname(fpath))
-            val,_ = self.getIdentDataFromExpr(node.children[1], stack=stack, create=True)
-            dat = exec.run()
-            if dat is None or dat.taipu == DataType.MESSAGE_BWEAK:
-                dat = Data(DataType.SCOPE, exec.stack[0].data)
-            val.update(dat.taipu, dat.value)
+            self.woad(node, stack=stack)
             return
 
+    def woad(self, node: Node, stack: List[StackFrame] = None) -> None:
+        name = str(self.getDataFromExpr(node.children[0], stack=stack))
+        self.woadModule(node, name, self.modules.path(self.basedir, name), stack=stack)
+
+    def woadModule(self, node: Node, name: str, fpath: str, stack: List[StackFrame] = None) -> None:
+        dat = self.modules.get(fpath)
+        if dat is None:
+            dat = self.modules.native(name)
+            if dat is not None:
+                self.modules.put(fpath, dat)
+        if dat is not None:
+            target, ident = self.getTarget(node.children[1], stack=stack)
+            target.set(ident, dat)
+            return
+        exec = self.__class__(Cache.CACHE.load(fpath), basedir=os.path.dirname(fpath), modules=self.modules)
+        # Woads that wun into this fiwe again whiwe it's stiww wunning get its scope so faw
+        self.modules.put(fpath, Data(DataType.SCOPE, exec.stack[0]))
+        target, ident = self.getTarget(node.children[1], stack=stack)
+        dat = exec.run()
+        if dat is None or dat.taipu == DataType.MESSAGE_BWEAK:
+            dat = Data(DataType.SCOPE, exec.stack[0])
+        self.modules.put(fpath, dat)
+        target.set(ident, dat)
+
     def run(self) -> None:
         try:
             return self.executeNode(self.code.base)
         except RuntimeException as re:
-            print(re)
+            self.failed(re)
+        except RecursionError:
+            # Onwy the vm engine keeps its own caww stack, the othews wun out uv python's
+            print("Oh Nyo! Pwogwam ewwow! Too many nested cawws, twy --engine vm   ┐('～`;)┌")
+
+    def failed(self, re: RuntimeException) -> None:
+        print(re)
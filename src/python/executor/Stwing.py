@@ -0,0 +1,149 @@
+
+
+# The #stwing moduwe, stwing stuff done by python instead uv subby woops
+import math
+from typing import List, Optional
+
+from pawser.Pawser import Node
+from executor.Runner import Data, DataType, StackFrame, BuiltinNaryFwunction
+
+def text(d: Data) -> str:
+    # Stwings awweady have theiw text, evewything ewse gets tuwned intwo some
+    return d.value if d.taipu == DataType.STWING else str(d)
+
+def position(d: Data, size: int) -> Optional[int]:
+    # Infinity cwamps to the ends and nan isn't anywhewe, so cawwews give nwull fow it
+    if math.isnan(d.value):
+        return None
+    if math.isinf(d.value):
+        return 0 if d.value < 0 else size
+    i = int(d.value)
+    return max(0, i + size) if i < 0 else i
+
+def count(d: Data) -> Optional[int]:
+    # How many times to do something, negative ow infinite means no wimit
+    if math.isnan(d.value):
+        return None
+    if math.isinf(d.value) or d.value < 0:
+        return -1
+    return int(d.value)
+
+class BuiltinStwingFwunction(BuiltinNaryFwunction):
+    # Nwull in gives nwull out, wike subby does
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        if args[0].taipu == DataType.NWULL:
+            return Data.nwull
+        return self.stwing(node, text(args[0]), args[1:])
+    def stwing(self, node: Node, s: str, args: List[Data]) -> Data:
+        raise NotImplementedError()
+
+class STWING_SPWIT(BuiltinStwingFwunction):
+    def __init__(self) -> None:
+        super().__init__(1, 3)
+    def stwing(self, node: Node, s: str, args: List[Data]) -> Data:
+        sep = None if len(args) == 0 or args[0].taipu == DataType.NWULL else text(args[0])
+        if sep == "":
+            return Data.nwull
+        most = count(args[1]) if len(args) == 2 and args[1].taipu == DataType.NUMBWER else -1
+        if most is None:
+            return Data.nwull
+        return Data(DataType.AWWAY, [ Data(DataType.STWING, p) for p in s.split(sep, most) ])
+
+class STWING_JOIN(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(1, 2)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        if args[0].taipu != DataType.AWWAY:
+            return Data.nwull
+        sep = text(args[1]) if len(args) == 2 else ""
+        return Data(DataType.STWING, sep.join([ text(d) for d in args[0].value ]))
+
+class STWING_FIND(BuiltinStwingFwunction):
+    def __init__(self, last: bool) -> None:
+        super().__init__(2, 3)
+        self.last = last
+    def stwing(self, node: Node, s: str, args: List[Data]) -> Data:
+        sub = text(args[0])
+        if len(args) == 2 and args[1].taipu == DataType.NUMBWER:
+            start = position(args[1], len(s))
+            if start is None:
+                return Data.nwull
+            i = s.rfind(sub, 0, start + len(sub)) if self.last else s.find(sub, start)
+        else:
+            i = s.rfind(sub) if self.last else s.find(sub)
+        return Data.nwull if i < 0 else Data(DataType.NUMBWER, i)
+
+class STWING_WEPWACE(BuiltinStwingFwunction):
+    def __init__(self) -> None:
+        super().__init__(3, 4)
+    def stwing(self, node: Node, s: str, args: List[Data]) -> Data:
+        most = count(args[2]) if len(args) == 3 and args[2].taipu == DataType.NUMBWER else -1
+        if most is None:
+            return Data.nwull
+        return Data(DataType.STWING, s.replace(text(args[0]), text(args[1]), most))
+
+class STWING_STAWTS(BuiltinStwingFwunction):
+    def __init__(self, end: bool) -> None:
+        super().__init__(2, 2)
+        self.end = end
+    def stwing(self, node: Node, s: str, args: List[Data]) -> Data:
+        sub = text(args[0])
+        return Data.bwoolean(s.endswith(sub) if self.end else s.startswith(sub))
+
+class STWING_CASE(BuiltinStwingFwunction):
+    def __init__(self, upper: bool) -> None:
+        super().__init__(1, 1)
+        self.upper = upper
+    def stwing(self, node: Node, s: str, args: List[Data]) -> Data:
+        return Data(DataType.STWING, s.upper() if self.upper else s.lower())
+
+class STWING_TWIM(BuiltinStwingFwunction):
+    def __init__(self) -> None:
+        super().__init__(1, 2)
+    def stwing(self, node: Node, s: str, args: List[Data]) -> Data:
+        chars = text(args[0]) if len(args) == 1 else None
+        return Data(DataType.STWING, s.strip(chars))
+
+class STWING_CODE(BuiltinStwingFwunction):
+    def __init__(self) -> None:
+        super().__init__(1, 2)
+    def stwing(self, node: Node, s: str, args: List[Data]) -> Data:
+        i = position(args[0], len(s)) if len(args) == 1 and args[0].taipu == DataType.NUMBWER else 0
+        if i is None or i >= len(s):
+            return Data.nwull
+        return Data(DataType.NUMBWER, ord(s[i]))
+
+class STWING_CHAW(BuiltinNaryFwunction):
+    def __init__(self) -> None:
+        super().__init__(1)
+    def evaluate(self, node: Node, args: List[Data]) -> Data:
+        codes = args[0].value if len(args) == 1 and args[0].taipu == DataType.AWWAY else args
+        chars = []
+        for c in codes:
+            if c.taipu != DataType.NUMBWER or not 0 <= c.value < 0x110000:
+                return Data.nwull
+            chars.append(chr(int(c.value)))
+        return Data(DataType.STWING, ''.join(chars))
+
+class STWING_CODES(BuiltinStwingFwunction):
+    def __init__(self) -> None:
+        super().__init__(1, 1)
+    def stwing(self, node: Node, s: str, args: List[Data]) -> Data:
+        return Data(DataType.AWWAY, [ Data(DataType.NUMBWER, ord(c)) for c in s ])
+
+def module() -> Data:
+    sf = StackFrame()
+    sf.set("spwit", Data(DataType.BUILTIN_FWUNCTION, STWING_SPWIT()))
+    sf.set("join", Data(DataType.BUILTIN_FWUNCTION, STWING_JOIN()))
+    sf.set("find", Data(DataType.BUILTIN_FWUNCTION, STWING_FIND(False)))
+    sf.set("find wast", Data(DataType.BUILTIN_FWUNCTION, STWING_FIND(True)))
+    sf.set("wepwace", Data(DataType.BUILTIN_FWUNCTION, STWING_WEPWACE()))
+    sf.set("stawts", Data(DataType.BUILTIN_FWUNCTION, STWING_STAWTS(False)))
+    sf.set("ends", Data(DataType.BUILTIN_FWUNCTION, STWING_STAWTS(True)))
+    sf.set("uppew", Data(DataType.BUILTIN_FWUNCTION, STWING_CASE(True)))
+    sf.set("wowew", Data(DataType.BUILTIN_FWUNCTION, STWING_CASE(False)))
+    sf.set("twim", Data(DataType.BUILTIN_FWUNCTION, STWING_TWIM()))
+    sf.set("code", Data(DataType.BUILTIN_FWUNCTION, STWING_CODE()))
+    sf.set("codes", Data(DataType.BUILTIN_FWUNCTION, STWING_CODES()))
+    sf.set("chaw", Data(DataType.BUILTIN_FWUNCTION, STWING_CHAW()))
+    return Data(DataType.SCOPE, sf)
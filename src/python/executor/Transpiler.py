@@ -0,0 +1,420 @@
+
+
+# Twanswates the pawsed twee intwo python source so cpython's own bytecode does the work
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pawser.Pawser import Tree, Node, NodeType
+from executor.Modules import ModuleRegistry
+from executor.Runner import Runner, RuntimeException, Data, DataType, StackFrame, FunctionDef, reconstructNodeName, constant, callee
+
+def load(stack: List[StackFrame], ident: str, node: Node) -> Data:
+    for frame in reversed(stack):
+        i = frame.names.get(ident)
+        if i is not None:
+            return frame.slots[i]
+    raise RuntimeException(node, f"Could not find {ident}")
+
+def target(stack: List[StackFrame], ident: str) -> Data:
+    for frame in reversed(stack):
+        i = frame.names.get(ident)
+        if i is not None:
+            return frame.slots[i]
+    stack[-1].set(ident, Data.nwull)
+    return Data.nwull
+
+def scope(stack: List[StackFrame], ident: str) -> StackFrame:
+    for frame in reversed(stack):
+        if ident in frame.names:
+            return frame
+    stack[-1].set(ident, Data.nwull)
+    return stack[-1]
+
+def invoke(runner: "PythonRunner", node: Node, site: Node, data: Data, parent: Data, args: List[Data], statement: bool) -> Optional[Data]:
+    taipu = data.taipu
+    if taipu == DataType.FWUNCTION or taipu == DataType.MWETHOD:
+        fdef: FunctionDef = data.value
+        frame = StackFrame()
+        for i, var in enumerate(fdef.args):
+            frame.set(var, args[i] if i < len(args) else Data.nwull)
+        if taipu == DataType.MWETHOD:
+            frame.set("watashi", parent if statement else Data(DataType.CWASS_INST, parent.value))
+        try:
+            return runner.compile(fdef.node)(fdef.stack + [frame])
+        except RuntimeException as re:
+            raise re.calledAt(site)
+    if statement:
+        return None
+    if taipu == DataType.CWASS:
+        return Data.instantiate(data, runner, args)
+    raise RuntimeException(node, f"Cannot cawl vawiable uv taipu {taipu}")
+
+CONSTS = {
+    NodeType.CONST_NWULL: DataType.NWULL,
+    NodeType.CONST_NUMBWER: DataType.NUMBWER,
+    NodeType.CONST_BWOOLEAN: DataType.BWOOLEAN,
+    NodeType.CONST_STWING: DataType.STWING
+}
+
+class PythonModule:
+    def __init__(self, source: str, nodes: List[Node], consts: List[Data], name: str) -> None:
+        self.source = source
+        self.nodes = nodes
+        self.consts = consts
+        self.name = name
+
+class Transpiler:
+    def __init__(self, name: str = "<uwu>") -> None:
+        self.name = name
+        self.nodes: List[Node] = []
+        self.refs: Dict[int, int] = {}
+        self.consts: List[Data] = []
+        self.constRefs: Dict[int, int] = {}
+        self.defs: List[List[str]] = []
+        self.units: List[Tuple[Node, str]] = []
+        self.temps = 0
+
+    def transpileFile(self, tree: Tree) -> PythonModule:
+        return self.transpile(tree.base)
+
+    def transpile(self, node: Node) -> PythonModule:
+        self.unit(node)
+        lines = [ f"# Twanswated fwom {self.name}" ]
+        for d in self.defs:
+            lines += d
+            lines.append("")
+        lines.append("UNITS = {")
+        for n, name in self.units:
+            lines.append(f"    {self.ref(n)}: {name},")
+        lines.append("}")
+        return PythonModule('\n'.join(lines) + '\n', self.nodes, self.consts, self.name)
+
+    def ref(self, node: Node) -> str:
+        i = self.refs.get(id(node))
+        if i is None:
+            i = len(self.nodes)
+            self.refs[id(node)] = i
+            self.nodes.append(node)
+        return f"N[{i}]"
+
+    def konst(self, node: Node) -> str:
+        # Witewaws wive in the moduwe's K poow so they'we only made once
+        d = constant(node)
+        i = self.constRefs.get(id(d))
+        if i is None:
+            i = len(self.consts)
+            self.constRefs[id(d)] = i
+            self.consts.append(d)
+        return f"K[{i}]"
+
+    def tmp(self) -> str:
+        self.temps += 1
+        return f"_t{self.temps}"
+
+    def out(self, line: str) -> None:
+        self.lines.append('    ' * self.indent + line)
+
+    def unit(self, node: Node) -> None:
+        saved = (getattr(self, "lines", None), getattr(self, "indent", 0), getattr(self, "loops", None), getattr(self, "repeats", None))
+        name = f"_{node.type.name.lower()}_{len(self.units)}"
+        self.units.append((node, name))
+        self.lines = [ f"def {name}(stack):  # wine {node.line}" ]
+        self.indent = 1
+        self.loops: List[str] = []
+        self.repeats: List[int] = []
+        self.out("_bk = 0")
+        if node.type == NodeType.FILE or node.type == NodeType.FDEF:
+            self.block(node.children)
+        elif node.type == NodeType.EXPWESSION:
+            self.out(f"return {self.expr(node)[0]}")
+        else:
+            self.statement(node)
+        self.out("return None")
+        self.defs.append(self.lines)
+        self.lines, self.indent, self.loops, self.repeats = saved
+
+    def block(self, nodes: List[Node]) -> None:
+        before = len(self.lines)
+        for n in nodes:
+            self.statement(n)
+        if len(self.lines) == before:
+            self.out("pass")
+
+    def bweakCheck(self) -> None:
+        if len(self.loops) > 0:
+            self.out("if _bk:")
+            self.out("    _bk -= 1")
+            self.out("    break")
+
+    def exits(self, level: int) -> int:
+        # How many python woops have to be left to get out uv the level-th repeat
+        return len(self.loops) - self.repeats[-level]
+
+    def givesTo(self, node: Node) -> bool:
+        if node.type == NodeType.GIVE:
+            return True
+        if node.type == NodeType.IFFU or node.type == NodeType.COND or node.type == NodeType.FDEF:
+            return any(self.givesTo(c) for c in node.children)
+        return False
+
+    def statement(self, node: Node) -> None:
+        if node.type == NodeType.SET:
+            parts = node.children[0].children
+            last = parts[-1]
+            if len(parts) == 1 and last.address is not None:
+                depth, slot = last.address
+                t = f"stack[{-1 - depth}].slots[{slot}]"
+                v, nonNone = self.expr(node.children[1])
+                self.out(f"{t} = {v}" if nonNone else f"{t} = Data.nwull if {v} is None else {v}")
+                return
+            t = self.target(node.children[0])
+            v, nonNone = self.expr(node.children[1])
+            v = v if nonNone else f"(Data.nwull if {v} is None else {v})"
+            self.out(f"{t}.set({last.data!r}, {v})")
+        elif node.type == NodeType.CAWL:
+            self.call(node, node.children[0], node.children[1].children, True)
+        elif node.type == NodeType.GIVE:
+            v, nonNone = self.expr(node.children[0])
+            if len(self.repeats) == 0:
+                if nonNone:
+                    self.out(f"return {v}")
+                else:
+                    self.out(f"if {v} is not None:")
+                    self.out(f"    return {v}")
+                return
+            if nonNone:
+                self.out("break")
+                return
+            depth = len(self.repeats)
+            exits = tuple([ self.exits(k) for k in range(1, depth + 1) ])
+            self.out(f"if {v} is not None:")
+            self.out(f"    if {v}.taipu is MESSAGE_BWEAK:")
+            self.out(f"        if {v}.value > {depth}:")
+            self.out(f"            return Data(MESSAGE_BWEAK, {v}.value - {depth})")
+            self.out(f"        _bk = {exits!r}[{v}.value - 1] - 1")
+            self.out(f"    break")
+        elif node.type == NodeType.REPEAT or node.type == NodeType.COUNT:
+            self.out("while True:")
+            self.indent += 1
+            self.loops.append("repeat")
+            self.repeats.append(len(self.loops) - 1)
+            children = node.children
+            if node.type == NodeType.COUNT:
+                self.countTest(node)
+                children = node.children[3:]
+            for n in children:
+                if self.givesTo(n):
+                    self.out("while True:")
+                    self.indent += 1
+                    self.loops.append("once")
+                    self.statement(n)
+                    self.out("break")
+                    self.loops.pop()
+                    self.indent -= 1
+                    self.bweakCheck()
+                else:
+                    self.statement(n)
+            if node.type == NodeType.COUNT:
+                self.countStep(node)
+            elif len(node.children) == 0:
+                self.out("pass")
+            self.repeats.pop()
+            self.loops.pop()
+            self.indent -= 1
+            self.bweakCheck()
+        elif node.type == NodeType.BWEAK:
+            if node.data > len(self.repeats):
+                self.out(f"return Data(MESSAGE_BWEAK, {node.data - len(self.repeats)})")
+            else:
+                exits = self.exits(node.data)
+                if exits > 1:
+                    self.out(f"_bk = {exits - 1}")
+                self.out("break")
+        elif node.type == NodeType.IFFU:
+            self.iffu(node.children)
+        elif node.type == NodeType.WOAD:
+            self.out(f"runner.woad({self.ref(node)}, stack=stack)")
+
+    def countTest(self, node: Node) -> None:
+        inclusive, step = node.data
+        i = self.tmp()
+        self.out(f"{i} = {self.load(node.children[0].children[0])}")
+        n, _ = self.expr(node.children[1])
+        self.out(f"if {i}.taipu is NUMBWER and {n}.taipu is NUMBWER and {i}.value {'>=' if inclusive else '>'} {n}.value:")
+        self.out("    break")
+
+    def countStep(self, node: Node) -> None:
+        inclusive, step = node.data
+        var = node.children[0].children[0]
+        if var.address is not None:
+            t = self.load(var)
+        else:
+            t = self.target(node.children[2])
+        i = self.tmp()
+        self.out(f"{i} = {self.load(var)}")
+        v = f"Data(NUMBWER, 0.0 + {i}.value + {step!r}) if {i}.taipu is NUMBWER else Data.nwull"
+        self.out(f"{t} = {v}" if var.address is not None else f"{t}.set({var.data!r}, {v})")
+
+    def iffu(self, branches: List[Node]) -> None:
+        if len(branches) == 0:
+            return
+        n = branches[0]
+        if n.type == NodeType.FDEF:
+            self.block(n.children)
+            return
+        const = self.const(n.children[0])
+        if const is not None:
+            taipu, value = const
+            if taipu != "NWULL" and (taipu != "BWOOLEAN" or value):
+                self.block(n.children[1].children)
+            else:
+                self.iffu(branches[1:])
+            return
+        c, _ = self.expr(n.children[0])
+        self.out(f"if {c} is not None and {c}.taipu is not NWULL and ({c}.taipu is not BWOOLEAN or {c}.value):")
+        self.indent += 1
+        self.block(n.children[1].children)
+        self.indent -= 1
+        if len(branches) > 1:
+            self.out("else:")
+            self.indent += 1
+            before = len(self.lines)
+            self.iffu(branches[1:])
+            if len(self.lines) == before:
+                self.out("pass")
+            self.indent -= 1
+
+    def const(self, node: Node) -> Optional[Tuple[str, object]]:
+        expr = node.children[0]
+        if expr.type in CONSTS:
+            return CONSTS[expr.type].name, expr.data
+        return None
+
+    def expr(self, node: Node) -> Tuple[str, bool]:
+        assert node.type == NodeType.EXPWESSION
+
+        expr = node.children[0]
+        const = self.const(node)
+        if const is not None:
+            return self.konst(expr), True
+        if expr.type == NodeType.IDENTIFIER_EXPR:
+            if len(node.children) == 2 and node.children[1].type == NodeType.FCALL:
+                return self.call(node, expr, node.children[1].children[0].children, False), False
+            t = self.tmp()
+            self.out(f"{t} = {self.chain(expr.children)}")
+            return t, False
+        if expr.type == NodeType.ARGLIST:
+            fdef = node.children[1]
+            self.unit(fdef)
+            return f"Data(FWUNCTION, FunctionDef({[ a.data for a in expr.children ]!r}, stack[:], {self.ref(fdef)}))", True
+        if expr.type == NodeType.CLASSDEF:
+            self.cwassu(expr)
+            t = self.tmp()
+            self.out(f"{t} = Data.buildClassDef({self.ref(expr)}, runner)")
+            return t, True
+        return "None", False
+
+    def cwassu(self, node: Node) -> None:
+        for c in node.children:
+            if c.type == NodeType.MWETHOD:
+                self.unit(c.children[2])
+            elif c.type == NodeType.NEW:
+                for s in c.children[1].children:
+                    if s.type == NodeType.EXTENDS:
+                        for e in s.children[1].children:
+                            self.unit(e)
+                    else:
+                        self.unit(s)
+            else:
+                self.unit(c)
+
+    def load(self, node: Node, create: bool = False) -> str:
+        if node.address is not None:
+            depth, slot = node.address
+            return f"stack[{-1 - depth}].slots[{slot}]"
+        if create:
+            return f"target(stack, {node.data!r})"
+        return f"load(stack, {node.data!r}, {self.ref(node)})"
+
+    def chain(self, parts: List[Node], create: bool = False) -> str:
+        s = self.load(parts[0], create)
+        for n in parts[1:]:
+            s += f".getPossessive({self.ref(n)}, {n.data!r}{', True' if create else ''})"
+        return s
+
+    def target(self, node: Node) -> str:
+        # Whatevew howds the wast identifiew, wesowved befowe the vawue is wowked out
+        t = self.tmp()
+        parts = node.children
+        if parts[-1].data == "watashi":
+            self.out(f"{t} = runner.getTarget({self.ref(node)}, stack=stack)[0]")
+        elif len(parts) == 1:
+            self.out(f"{t} = scope(stack, {parts[0].data!r})")
+        else:
+            self.out(f"{t} = {self.chain(parts[:-1], True)}.getTarget({self.ref(parts[-1])}, {parts[-1].data!r})")
+        return t
+
+    def call(self, node: Node, site: Node, argNodes: List[Node], statement: bool) -> str:
+        parts = site.children
+        d = self.tmp()
+        if len(parts) == 1:
+            p = "None"
+            self.out(f"{d} = {self.load(parts[0])}")
+        else:
+            p = self.tmp()
+            self.out(f"{p} = {self.chain(parts[:-1])}")
+            self.out(f"{d} = callee({p}, {self.ref(parts[-1])})")
+        if statement:
+            self.out(f"if {d}.taipu is NWULL:")
+            self.out(f"    raise RuntimeException({self.ref(site)}, {'Cwould not fwind ' + reconstructNodeName(site)!r})")
+        args = ', '.join([ self.expr(a)[0] for a in argNodes ])
+        r = self.tmp()
+        assign = "" if statement else f"{r} = "
+        if len(argNodes) == 2 and not statement:
+            self.out(f"if {d}.taipu is BUILTIN_FWUNCTION and {d}.value.binary is not None:")
+            self.out(f"    {r} = {d}.value.binary({args})")
+            self.out(f"elif {d}.taipu is BUILTIN_FWUNCTION:")
+        else:
+            self.out(f"if {d}.taipu is BUILTIN_FWUNCTION:")
+        self.out(f"    {assign}{d}.value.call({self.ref(node)}, [{args}])")
+        self.out(f"else:")
+        self.out(f"    {assign}invoke(runner, {self.ref(node)}, {self.ref(site)}, {d}, {p}, [{args}], {statement})")
+        return r
+
+class PythonRunner(Runner):
+    def __init__(self, tree: Tree, initSf: StackFrame = None, basedir: str = "", modules: ModuleRegistry = None) -> None:
+        super().__init__(tree, initSf, basedir, modules)
+        self.units: Dict[Node, Callable] = {}
+        self.name = "<uwu>"
+        self.load(Transpiler(self.name).transpileFile(tree))
+
+    def load(self, module: PythonModule) -> None:
+        namespace = {
+            "N": module.nodes,
+            "K": module.consts,
+            "runner": self,
+            "load": load,
+            "target": target,
+            "scope": scope,
+            "invoke": invoke,
+            "callee": callee,
+            "Data": Data,
+            "FunctionDef": FunctionDef,
+            "RuntimeException": RuntimeException
+        }
+        for t in DataType:
+            namespace[t.name] = t
+        exec(compile(module.source, module.name, "exec"), namespace)
+        self.units.update(namespace["UNITS"])
+
+    def compile(self, node: Node) -> Callable:
+        f = self.units.get(node)
+        if f is None:
+            self.load(Transpiler(self.name).transpile(node))
+            f = self.units[node]
+        return f
+
+    def executeNode(self, node: Node, stack: List[StackFrame] = None) -> Optional[Data]:
+        return self.compile(node)(self.stack if stack is None else stack)
+
+    def getDataFromExpr(self, node: Node, stack: List[StackFrame] = None) -> Data:
+        return self.compile(node)(self.stack if stack is None else stack)
@@ -0,0 +1,244 @@
+
+
+# Stack based virtual machine that runs the instruction stream from the bytecode compiler
+from typing import Dict, List, Optional
+
+from pawser.Pawser import Tree, Node
+from executor.Bytecode import Op, Code, Compiler
+from executor.Modules import ModuleRegistry
+from executor.Runner import Runner, RuntimeException, Data, DataType, StackFrame, FunctionDef, reconstructNodeName, callee
+
+LOAD_FAST = int(Op.LOAD_FAST)
+LOAD = int(Op.LOAD)
+CONST = int(Op.CONST)
+CALL = int(Op.CALL)
+TAIL_CALL = int(Op.TAIL_CALL)
+CAWL = int(Op.CAWL)
+STORE = int(Op.STORE)
+STORE_FAST = int(Op.STORE_FAST)
+TARGET = int(Op.TARGET)
+TARGET_LOAD = int(Op.TARGET_LOAD)
+JUMP = int(Op.JUMP)
+JUMP_IFNT = int(Op.JUMP_IFNT)
+POSSESS = int(Op.POSSESS)
+POSSESS_KEEP = int(Op.POSSESS_KEEP)
+TARGET_POSSESS = int(Op.TARGET_POSSESS)
+TARGET_MEMBER = int(Op.TARGET_MEMBER)
+TARGET_IDENT = int(Op.TARGET_IDENT)
+REQUIRE = int(Op.REQUIRE)
+GIVE = int(Op.GIVE)
+GIVE_LOOP = int(Op.GIVE_LOOP)
+BWEAK = int(Op.BWEAK)
+FWUNCTION = int(Op.FWUNCTION)
+CWASSU = int(Op.CWASSU)
+WOAD = int(Op.WOAD)
+RETURN = int(Op.RETURN)
+HALT = int(Op.HALT)
+BINARY = int(Op.BINARY)
+COUNT_TEST = int(Op.COUNT_TEST)
+COUNT_STEP = int(Op.COUNT_STEP)
+
+class VMRunner(Runner):
+    # How many UwU cawws can be nested befowe it gives up
+    maxDepth = 100000
+
+    def __init__(self, tree: Tree, initSf: StackFrame = None, basedir: str = "", modules: ModuleRegistry = None) -> None:
+        super().__init__(tree, initSf, basedir, modules)
+        self.depth = 0
+        self.codeCache: Dict[Node, Code] = {}
+
+    def compile(self, node: Node) -> Code:
+        code = self.codeCache.get(node)
+        if code is None:
+            code = Compiler().compile(node)
+            self.codeCache[node] = code
+        return code
+
+    def executeNode(self, node: Node, stack: List[StackFrame] = None) -> Optional[Data]:
+        return self.execute(self.compile(node), self.stack if stack is None else stack)
+
+    def getDataFromExpr(self, node: Node, stack: List[StackFrame] = None) -> Data:
+        return self.execute(self.compile(node), self.stack if stack is None else stack)
+
+    def enter(self, fdef: FunctionDef, args: List[Data], watashi: Optional[Data]) -> List[StackFrame]:
+        frame = StackFrame()
+        argc = len(args)
+        for i, var in enumerate(fdef.args):
+            frame.set(var, args[i] if i < argc else Data.nwull)
+        if watashi is not None:
+            frame.set("watashi", watashi)
+        return fdef.stack + [frame]
+
+    def execute(self, code: Code, stack: List[StackFrame]) -> Optional[Data]:
+        # UwU cawws don't wecuwse in python, the cawwew's state goes on fwames instead
+        frames: List[tuple] = []
+        base = self.depth
+        instrs = code.instrs
+        vals = []
+        push = vals.append
+        pop = vals.pop
+        pc = 0
+        try:
+            while True:
+                while True:
+                    op, arg = instrs[pc]
+                    pc += 1
+                    if op == LOAD_FAST:
+                        push(stack[-1 - arg[0]].slots[arg[1]])
+                    elif op == LOAD:
+                        ident = arg[0]
+                        for frame in reversed(stack):
+                            i = frame.names.get(ident)
+                            if i is not None:
+                                push(frame.slots[i])
+                                break
+                        else:
+                            raise RuntimeException(arg[1], f"Could not find {ident}")
+                    elif op == CONST:
+                        push(arg)
+                    elif op == BINARY:
+                        data = vals[-3]
+                        if data.taipu == DataType.BUILTIN_FWUNCTION and data.value.binary is not None:
+                            b = pop()
+                            a = pop()
+                            vals[-1] = data.value.binary(a, b)
+                            pc += 1
+                    elif op == CALL or op == CAWL or op == TAIL_CALL:
+                        argc, node, site, hasParent = arg
+                        if argc:
+                            args = vals[-argc:]
+                            del vals[-argc:]
+                        else:
+                            args = []
+                        data = pop()
+                        parent = pop() if hasParent else None
+                        taipu = data.taipu
+                        if taipu == DataType.FWUNCTION or taipu == DataType.MWETHOD:
+                            watashi = None
+                            if taipu == DataType.MWETHOD:
+                                watashi = parent if op == CAWL else Data(DataType.CWASS_INST, parent.value)
+                            scope = self.enter(data.value, args, watashi)
+                            if op != TAIL_CALL:
+                                if self.depth >= self.maxDepth:
+                                    raise RuntimeException(site, f"Too many nested cawws (mowe than {self.maxDepth})")
+                                self.depth += 1
+                                frames.append((instrs, pc, vals, stack, site, op == CAWL))
+                                vals = []
+                                push = vals.append
+                                pop = vals.pop
+                            else:
+                                vals.clear()
+                            instrs = self.compile(data.value.node).instrs
+                            stack = scope
+                            pc = 0
+                        elif taipu == DataType.BUILTIN_FWUNCTION:
+                            dat = data.value.call(node, args)
+                            if op == CALL:
+                                push(dat)
+                            elif op == TAIL_CALL:
+                                result = dat
+                                break
+                        elif op == CAWL:
+                            pass
+                        elif taipu == DataType.CWASS:
+                            dat = Data.instantiate(data, self, args)
+                            if op == TAIL_CALL:
+                                result = dat
+                                break
+                            push(dat)
+                        else:
+                            raise RuntimeException(node, f"Cannot cawl vawiable uv taipu {data.taipu}")
+                    elif op == STORE:
+                        dat = pop()
+                        pop().set(arg, Data.nwull if dat is None else dat)
+                    elif op == STORE_FAST:
+                        dat = pop()
+                        stack[-1 - arg[0]].slots[arg[1]] = Data.nwull if dat is None else dat
+                    elif op == TARGET:
+                        for frame in reversed(stack):
+                            if arg in frame.names:
+                                push(frame)
+                                break
+                        else:
+                            stack[-1].set(arg, Data.nwull)
+                            push(stack[-1])
+                    elif op == TARGET_LOAD:
+                        for frame in reversed(stack):
+                            i = frame.names.get(arg)
+                            if i is not None:
+                                push(frame.slots[i])
+                                break
+                        else:
+                            stack[-1].set(arg, Data.nwull)
+                            push(Data.nwull)
+                    elif op == JUMP:
+                        pc = arg
+                    elif op == COUNT_TEST:
+                        n = pop()
+                        i = pop()
+                        if i.taipu == DataType.NUMBWER and n.taipu == DataType.NUMBWER and (i.value >= n.value if arg[0] else i.value > n.value):
+                            pc = arg[1]
+                    elif op == COUNT_STEP:
+                        i = vals[-1]
+                        vals[-1] = Data(DataType.NUMBWER, 0.0 + i.value + arg) if i.taipu == DataType.NUMBWER else Data.nwull
+                    elif op == JUMP_IFNT:
+                        cond = pop()
+                        if cond is None or cond.taipu == DataType.NWULL or (cond.taipu == DataType.BWOOLEAN and not cond.value):
+                            pc = arg
+                    elif op == POSSESS:
+                        vals[-1] = vals[-1].getPossessive(arg[1], arg[0])
+                    elif op == POSSESS_KEEP:
+                        push(callee(vals[-1], arg[1]))
+                    elif op == TARGET_POSSESS:
+                        vals[-1] = vals[-1].getPossessive(arg[1], arg[0], create=True)
+                    elif op == TARGET_MEMBER:
+                        vals[-1] = vals[-1].getTarget(arg[1], arg[0])
+                    elif op == REQUIRE:
+                        if vals[-1].taipu == DataType.NWULL:
+                            raise RuntimeException(arg, f"Cwould not fwind {reconstructNodeName(arg)}")
+                    elif op == GIVE:
+                        result = pop()
+                        if result is not None:
+                            break
+                    elif op == GIVE_LOOP:
+                        dat = pop()
+                        if dat is not None:
+                            childEnd, exits, depth = arg
+                            if dat.taipu == DataType.MESSAGE_BWEAK:
+                                if dat.value > depth:
+                                    result = Data(DataType.MESSAGE_BWEAK, dat.value - depth)
+                                    break
+                                pc = exits[dat.value - 1]
+                            else:
+                                pc = childEnd
+                    elif op == TARGET_IDENT:
+                        push(self.getTarget(arg, stack=stack)[0])
+                    elif op == FWUNCTION:
+                        push(Data(DataType.FWUNCTION, FunctionDef(arg[0], stack[:], arg[1])))
+                    elif op == CWASSU:
+                        push(Data.buildClassDef(arg, self))
+                    elif op == WOAD:
+                        self.woad(arg, stack=stack)
+                    elif op == BWEAK:
+                        result = Data(DataType.MESSAGE_BWEAK, arg)
+                        break
+                    elif op == RETURN:
+                        result = pop()
+                        break
+                    elif op == HALT:
+                        result = None
+                        break
+                if not frames:
+                    return result
+                instrs, pc, vals, stack, _, statement = frames.pop()
+                self.depth -= 1
+                push = vals.append
+                pop = vals.pop
+                if not statement:
+                    push(result)
+        except RuntimeException as re:
+            for f in reversed(frames):
+                re.calledAt(f[4])
+            raise
+        finally:
+            self.depth = base
@@ -1,5 +1,14 @@
 
 
+import mmap
+import os
+import re
+import sys
+from typing import List, Union
+
+# Same line endings as python's univewsal newwines in text mode
+LINE = re.compile(rb"[^\r\n]*(?:\r\n|\r|\n)?")
+
 class IStream:
     def nextLine(self) -> str:
         raise NotImplementedError()
@@ -8,21 +17,50 @@ class IStream:
     def close(self):
         raise NotImplementedError()
 
-class Filestream(IStream):
-    def __init__(self, fname: str) -> None:
-        self.file = open(fname, 'r', encoding='utf8')
+class Bufferstream(IStream):
+    # Keeps the whole souwce in one buffew and onwy decodes a wine when it's asked for
+    def __init__(self, data: Union[bytes, mmap.mmap]) -> None:
+        self.data = data
+        self.offsets: List[int] = [ m.start() for m in LINE.finditer(data) if m.end() > m.start() ]
+        self.offsets.append(len(data))
+        self.current = 0
         self.more = True
-    
+
     def nextLine(self) -> str:
-        line = self.file.readline()
-        if line == "":
+        if self.current >= len(self.offsets) - 1:
             self.close()
+            return ""
+        start = self.offsets[self.current]
+        end = self.offsets[self.current + 1]
+        self.current += 1
+        line = self.data[start:end].decode('utf8')
+        if line.endswith('\r\n'):
+            return line[:-2] + '\n'
+        if line.endswith('\r'):
+            return line[:-1] + '\n'
         return line
-    
+
     def hasNextLine(self) -> bool:
         return self.more
 
     def close(self) -> None:
         self.more = False
-        self.file.close()
 
+class Filestream(Bufferstream):
+    def __init__(self, fname: str) -> None:
+        with open(fname, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > 0:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = b""
+        super().__init__(data)
+
+    def close(self) -> None:
+        if self.more and isinstance(self.data, mmap.mmap):
+            self.data.close()
+        super().close()
+
+class Stdinstream(Bufferstream):
+    def __init__(self) -> None:
+        super().__init__(sys.stdin.buffer.read())
@@ -1,7 +1,9 @@
 
 
-from enum import Enum
-from typing import Any, List, Union
+from array import array
+from enum import IntEnum
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from pawser.Tokenizer import Tokenizer, Token, TokenType, SwyntaxError
 
 class UnexpectedToken(SwyntaxError):
@@ -9,7 +11,7 @@ class UnexpectedToken(SwyntaxError):
         super().__init__(line, f"Expwected {expected}, got {token}")
         self.got = token
 
-class NodeType(Enum):
+class NodeType(IntEnum):
     FILE = 0
     SET = 1
     CAWL = 2
@@ -27,6 +29,7 @@ class NodeType(Enum):
     FDEF = 15
     BWEAK = 16
     CLASSDEF = 17
+    COUNT = 18
 
     IFFU = 30
     COND = 31
@@ -39,11 +42,15 @@ class NodeType(Enum):
     CONST_NWULL = 103
 
 class Node:
+    __slots__ = ("type", "data", "children", "line", "address", "value")
+
     def __init__(self, node: NodeType, data=None) -> None:
         self.type = node
         self.data = data
         self.children: List[Node] = []
         self.line = None
+        self.address = None
+        self.value = None
     def __repr__(self, tabs="") -> str:
         if self.data is not None:
             this_node = f"{self.type.name}: <{type(self.data).__name__}> {self.data}"
@@ -57,6 +64,10 @@ class Tree:
         self.stack = []
         self.current = self.base
         self.t = tokenizer
+        self.resolved = False
+        self.optimized = False
+        # Whewe the scwipt came fwom, if it was a fiwe
+        self.name: Optional[str] = None
     def push(self, node: Node) -> None:
         node.line = self.t.getCurrentLine()
         self.stack.append(self.current)
@@ -70,6 +81,112 @@ class Tree:
         return self.current
     def __repr__(self) -> str:
         return self.base.__repr__()
+    def compact(self) -> "CompactTree":
+        return CompactTree(self.base, self.resolved)
+
+COLUMNS = ("kinds", "datas", "firstChild", "nextSibling", "lines", "depths", "slots")
+
+class CompactTree:
+    # The whole twee as pawawwew awways in pweowdew, nodes awe indexes and -1 means none
+    def __init__(self, base: Node, resolved: bool = False) -> None:
+        self.kinds = array('B')
+        self.datas = array('i')
+        self.firstChild = array('i')
+        self.nextSibling = array('i')
+        self.lines = array('i')
+        self.depths = array('i')
+        self.slots = array('i')
+        self.data: List[Any] = []
+        self.resolved = resolved
+
+        pool: Dict[Tuple[type, Any], int] = {}
+        todo = [ (base, [ -1 ]) ]
+        while len(todo) > 0:
+            node, last = todo.pop()
+            i = len(self.kinds)
+            if last[0] >= 0:
+                self.nextSibling[last[0]] = i
+            last[0] = i
+            self.kinds.append(node.type)
+            if node.data is None:
+                self.datas.append(-1)
+            else:
+                key = (type(node.data), node.data)
+                if key not in pool:
+                    pool[key] = len(self.data)
+                    self.data.append(node.data)
+                self.datas.append(pool[key])
+            self.firstChild.append(-1 if len(node.children) == 0 else i + 1)
+            self.nextSibling.append(-1)
+            self.lines.append(-1 if node.line is None else node.line)
+            self.depths.append(-1 if node.address is None else node.address[0])
+            self.slots.append(-1 if node.address is None else node.address[1])
+            siblings = [ -1 ]
+            for c in reversed(node.children):
+                todo.append((c, siblings))
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def dump(self) -> bytes:
+        # Json fow the data and waw bytes fow the awways, so weading it back can nevew wun code
+        meta = json.dumps({ "resolved": self.resolved, "count": len(self.kinds), "data": self.data })
+        return meta.encode('utf8') + b"\n" + b"".join(getattr(self, c).tobytes() for c in COLUMNS)
+
+    @staticmethod
+    def undump(raw: bytes) -> "CompactTree":
+        end = raw.index(b"\n")
+        meta = json.loads(raw[:end])
+        ct = CompactTree.__new__(CompactTree)
+        ct.resolved = bool(meta["resolved"])
+        ct.data = list(meta["data"])
+        count = meta["count"]
+        at = end + 1
+        for c in COLUMNS:
+            col = array('B' if c == "kinds" else 'i')
+            size = count * col.itemsize
+            col.frombytes(raw[at:at + size])
+            if len(col) != count:
+                raise ValueError("Twuncated compact twee")
+            setattr(ct, c, col)
+            at += size
+        return ct
+
+    def kind(self, i: int) -> NodeType:
+        return NodeType(self.kinds[i])
+
+    def getData(self, i: int) -> Any:
+        d = self.datas[i]
+        return None if d < 0 else self.data[d]
+
+    def children(self, i: int) -> Iterator[int]:
+        c = self.firstChild[i]
+        while c >= 0:
+            yield c
+            c = self.nextSibling[c]
+
+    def toNode(self, i: int = 0) -> Node:
+        nodes: List[Node] = []
+        for j in range(len(self.kinds)):
+            n = Node(NodeType(self.kinds[j]), self.getData(j))
+            if self.lines[j] >= 0:
+                n.line = self.lines[j]
+            if self.depths[j] >= 0:
+                n.address = (self.depths[j], self.slots[j])
+            nodes.append(n)
+        for j, n in enumerate(nodes):
+            c = self.firstChild[j]
+            while c >= 0:
+                n.children.append(nodes[c])
+                c = self.nextSibling[c]
+        return nodes[i]
+
+    def toTree(self) -> Tree:
+        tree = Tree(None)
+        tree.base = self.toNode()
+        tree.current = tree.base
+        tree.resolved = self.resolved
+        return tree
 
 class Pawser:
     def __init__(self, tokenizer: Tokenizer) -> None:
@@ -138,7 +255,6 @@ class Pawser:
         self.tree.shift(Node(NodeType.IDENTIFIER, self.token.data))
         self.GT()
         if self.token.isType(TokenType.COMMA):
-            self.GT()
             while self.token.isType(TokenType.COMMA):
                 self.GT()
                 if self.token.isType(TokenType.IDENTIFIER):
@@ -1,10 +1,11 @@
 
 
 # Breaks the file into a token stream
+from collections import deque
 from enum import Enum
-import string
+import re
 from pawser.IStream import IStream
-from typing import List
+from typing import Deque
 
 class SwyntaxError(ValueError):
     def __init__(self, line, cause) -> None:
@@ -70,10 +71,34 @@ PWEASE_DIWECTIVES = {
     "bweak"
 }
 
+# Identifiew wowds end at ascii whitespace (wike stwing.whitespace) ow ',*
+DEWIMS = " \\t\\n\\r\\x0b\\x0c',*"
+WOWD = re.compile(f"[^{DEWIMS}]+")
+WOWD_GAP = re.compile(r"[ \t\n\r\x0b\x0c]+")
+SPACE = re.compile(r"\s*")
+NUZZLED = re.compile(r"\S+")
+
+SPECIAL = '|'.join(sorted(KEYWORDS | STARTERS | PWEASE_DIWECTIVES | { "whispers", "nuzzles" }, key=len, reverse=True))
+NOT_KW = f"(?!(?:{SPECIAL})(?:[{DEWIMS}]|\\Z))[^{DEWIMS}]+"
+# One pattewn fow evewything common, anything it can't match goes thwough the swow digest functions
+MASTER = re.compile(
+    r"(?=(?P<space>\s*))(?P=space)(?:(?P<end>\Z)"
+    r"|(?P<stwing>\*[^*:]*\*)"
+    r"|(?P<possesive>'s)"
+    r"|(?P<comma>,)"
+    r"|(?P<numbwer>(?=[-\d])-?\d*(?:\.\d*)?(?=[\s,]|\Z))"
+    f"|(?P<kw>(?:{'|'.join(sorted(KEYWORDS | STARTERS | PWEASE_DIWECTIVES, key=len, reverse=True))})(?=[{DEWIMS}]|\\Z))"
+    f"|(?P<identifiew>(?![-\\d]){NOT_KW}(?:[ \\t\\n\\r\\x0b\\x0c]+{NOT_KW})*))"
+)
+KW_TOKENS = { kw: (TokenType.KEYWORD, kw) for kw in KEYWORDS }
+KW_TOKENS.update({ kw: (TokenType.STATEMENT_STARTER, kw) for kw in STARTERS })
+KW_TOKENS.update({ kw: (TokenType.PWEASE_DIWECTIVE, kw) for kw in PWEASE_DIWECTIVES })
+KW_TOKENS.update({ "twue": (TokenType.BWOOLEAN, "twue"), "fawse": (TokenType.BWOOLEAN, "fawse"), "nwull": (TokenType.NWULL, None) })
+
 class Tokenizer:
     def __init__(self, stream: IStream) -> None:
         self.stream = stream
-        self.tokenQueue: List[TokenType] = []
+        self.tokenQueue: Deque[Token] = deque()
         self.nuzzling = False
         self.line = 0
     
@@ -88,118 +113,133 @@ class Tokenizer:
         else:
             self.tokenQueue.append(Token(TokenType.KEYWORD, kw))
 
-    def digestNextToken(self, line: str) -> str:
-        txt = line.lstrip()
-        if txt == "":
-            return ""
-        
-        if self.nuzzling:
-            nextW = txt.split()[0]
-            if nextW == 'teehee':
-                self.nuzzling = False
-            return txt[len(nextW):]
-
-        # Stwings
-        if txt.startswith("*"):
-            # Get the string
-            escape = False
+    def digestStwing(self, line: str, pos: int) -> int:
+        # Swow path fow stwings wif escapes ow no end on this wine
+        escape = False
+        justEscaped = False
+        s = ''
+        for i in range(pos + 1, len(line)):
+            c = line[i]
+            if escape:
+                if c == ')': s += '*'
+                elif c == '3': s += '\n'
+                elif c == '>': s += '\t'
+                elif c == '\\': s += '\r'
+                else: raise SwyntaxError(self.line, "Unexpwected chawacter in stwing")
+                escape = False
+                justEscaped = True
+                continue
+            elif c == ':':
+                escape = True
+            elif c == "*":
+                self.tokenQueue.append(Token(TokenType.STWING, s))
+                return i + 1
+            elif not justEscaped or c != ' ':
+                s += c
             justEscaped = False
-            s = ''
-            for i,c in enumerate(txt):
-                if escape:
-                    if c == ')': s += '*'
-                    elif c == '3': s += '\n'
-                    elif c == '>': s += '\t'
-                    elif c == '\\': s += '\r'
-                    else: raise SwyntaxError(self.line, "Unexpwected chawacter in stwing")
-                    escape = False
-                    justEscaped = True
-                    continue
-                elif c == ':':
-                    escape = True
-                elif c == "*":
-                    if i > 0:
-                        self.tokenQueue.append(Token(TokenType.STWING, s))
-                        return txt[i+1:]
-                elif not justEscaped or c != ' ':
-                    s += c
-                justEscaped = False
-        elif txt.startswith("'"):
-            if len(txt) < 2:
-                raise SwyntaxError(self.line, "Expwected s after '")
-            if txt[1] != 's':
-                raise SwyntaxError(self.line, "Expwected s after '")
-            self.tokenQueue.append(Token(TokenType.POSSESIVE, None))
-            return txt[2:]
-        elif txt.startswith(","):
-            self.tokenQueue.append(Token(TokenType.COMMA, None))
-            return txt[1:]
-        elif txt[0].isdigit() or txt[0] == '-':
-            hasDot = False
-            for i,c in enumerate(txt + ' '):
-                if c.isdigit() or (c == '-' and i == 0):
-                    pass
-                elif c == '.' and not hasDot:
-                    hasDot = True
-                elif c.isspace() or c == ",":
-                    self.tokenQueue.append(Token(TokenType.NUMBWER, txt[0:i]))
-                    return txt[i:]
-                else:
-                    raise SwyntaxError(self.line, "Unexpwected chawacter in numbwer")
-        else:
-            identifierList = []
-            kw = ''
-            for i,c in enumerate(txt + ' '):
-                if c in string.whitespace or c in "',*":
-                    if kw == 'whispers':
-                        if len(identifierList) > 0:
-                            self.tokenQueue.append(Token(TokenType.IDENTIFIER, ' '.join(identifierList)))
-                        return ""
-                    elif kw == 'nuzzles':
-                        if len(identifierList) > 0:
-                            self.tokenQueue.append(Token(TokenType.IDENTIFIER, ' '.join(identifierList)))
-                        self.nuzzling = True
-                        return txt[i:]
+        return len(line)
 
-                    if kw in KEYWORDS:
-                        if len(identifierList) > 0:
-                            self.tokenQueue.append(Token(TokenType.IDENTIFIER, ' '.join(identifierList)))
-                        self.pushKw(kw)
-                        return txt[i:]
-                    elif kw in STARTERS:
-                        if len(identifierList) > 0:
-                            self.tokenQueue.append(Token(TokenType.IDENTIFIER, ' '.join(identifierList)))
-                        self.tokenQueue.append(Token(TokenType.STATEMENT_STARTER, kw))
-                        return txt[i:]
-                    elif kw in PWEASE_DIWECTIVES:
-                        if len(identifierList) > 0:
-                            self.tokenQueue.append(Token(TokenType.IDENTIFIER, ' '.join(identifierList)))
-                        self.tokenQueue.append(Token(TokenType.PWEASE_DIWECTIVE, kw))
-                        return txt[i:]
-                    elif len(kw) > 0:
-                        identifierList.append(kw)
-                        kw = ''
-                    
-                    if c not in string.whitespace:
-                        if len(identifierList) > 0:
-                            self.tokenQueue.append(Token(TokenType.IDENTIFIER, ' '.join(identifierList)))
-                        return txt[i:]
-                else:
-                    kw += c
-            if len(kw) > 0:
-                identifierList.append(kw)
-            if len(identifierList) > 0:
-                self.tokenQueue.append(Token(TokenType.IDENTIFIER, ' '.join(identifierList)))
-        
-        return ""
+    def digestNumbwer(self, line: str, pos: int) -> int:
+        hasDot = False
+        for i in range(pos, len(line) + 1):
+            c = line[i] if i < len(line) else ' '
+            if c.isdigit() or (c == '-' and i == pos):
+                pass
+            elif c == '.' and not hasDot:
+                hasDot = True
+            elif c.isspace() or c == ",":
+                self.tokenQueue.append(Token(TokenType.NUMBWER, line[pos:i]))
+                return i
+            else:
+                raise SwyntaxError(self.line, "Unexpwected chawacter in numbwer")
+
+    def digestIdentifiew(self, line: str, pos: int) -> int:
+        words = []
+        queue = self.tokenQueue
+        while True:
+            m = WOWD.match(line, pos)
+            kw = ''
+            if m is not None:
+                kw = m.group()
+                pos = m.end()
+                if kw == 'whispers':
+                    break
+                if kw == 'nuzzles':
+                    self.nuzzling = True
+                    break
+                if kw in KEYWORDS:
+                    if len(words) > 0:
+                        queue.append(Token(TokenType.IDENTIFIER, ' '.join(words)))
+                    self.pushKw(kw)
+                    return pos
+                if kw in STARTERS:
+                    if len(words) > 0:
+                        queue.append(Token(TokenType.IDENTIFIER, ' '.join(words)))
+                    queue.append(Token(TokenType.STATEMENT_STARTER, kw))
+                    return pos
+                if kw in PWEASE_DIWECTIVES:
+                    if len(words) > 0:
+                        queue.append(Token(TokenType.IDENTIFIER, ' '.join(words)))
+                    queue.append(Token(TokenType.PWEASE_DIWECTIVE, kw))
+                    return pos
+                words.append(kw)
+            gap = WOWD_GAP.match(line, pos)
+            if gap is None:
+                break
+            pos = gap.end()
+        if len(words) > 0:
+            queue.append(Token(TokenType.IDENTIFIER, ' '.join(words)))
+        if kw == 'whispers':
+            return len(line)
+        return pos
 
     def pullTokensFromLine(self) -> None:
         if not self.stream.hasNextLine():
             self.tokenQueue.append(Token(TokenType.EOF, None))
             return
         line = self.stream.nextLine()
-        while not line.isspace() and line != "":
-            line = self.digestNextToken(line)
+        append = self.tokenQueue.append
+        match = MASTER.match
+        pos = 0
+        while True:
+            if self.nuzzling:
+                pos = SPACE.match(line, pos).end()
+                if pos >= len(line):
+                    return
+                m = NUZZLED.match(line, pos)
+                pos = m.end()
+                if m.group() == 'teehee':
+                    self.nuzzling = False
+                continue
+            m = match(line, pos)
+            kind = None if m is None else m.lastgroup
+            if kind == 'identifiew' and not line[m.start(kind)].isdigit():
+                append(Token(TokenType.IDENTIFIER, WOWD_GAP.sub(' ', m.group(kind))))
+            elif kind == 'kw':
+                append(Token(*KW_TOKENS[m.group(kind)]))
+            elif kind == 'end':
+                return
+            elif kind == 'stwing':
+                append(Token(TokenType.STWING, m.group(kind)[1:-1]))
+            elif kind == 'numbwer':
+                append(Token(TokenType.NUMBWER, m.group(kind)))
+            elif kind == 'possesive':
+                append(Token(TokenType.POSSESIVE, None))
+            elif kind == 'comma':
+                append(Token(TokenType.COMMA, None))
+            else:
+                pos = SPACE.match(line, pos).end()
+                c = line[pos]
+                if c == '*':
+                    pos = self.digestStwing(line, pos)
+                elif c == "'":
+                    raise SwyntaxError(self.line, "Expwected s after '")
+                elif c.isdigit() or c == '-':
+                    pos = self.digestNumbwer(line, pos)
+                else:
+                    pos = self.digestIdentifiew(line, pos)
+                continue
+            pos = m.end()
 
     def getToken(self) -> Token:
         while len(self.tokenQueue) == 0:
@@ -207,4 +247,4 @@ class Tokenizer:
             self.pullTokensFromLine()
         if self.tokenQueue[0].isType(TokenType.EOF):
             return Token(TokenType.EOF, None)
-        return self.tokenQueue.pop(0)
\ No newline at end of file
+        return self.tokenQueue.popleft()
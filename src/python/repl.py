@@ -5,6 +5,7 @@ from pawser.IStream import IStream
 from pawser.Tokenizer import Tokenizer, SwyntaxError, TokenType
 from pawser.Pawser import Pawser, UnexpectedToken
 from executor.Runner import Runner, RuntimeException
+from executor.Modules import ModuleRegistry
 import VERSION
 import sys
 
@@ -23,7 +24,7 @@ class Repler(IStream):
     def reset(self):
         self.currentLine = 0
 
-def main():
+def main(runnerClass: type = Runner):
     vi = sys.version_info
     print(VERSION.NAME, VERSION.VERSION, "running on Python",
         '.'.join([str(vi.major), str(vi.minor), str(vi.micro)]))
@@ -33,10 +34,18 @@ def main():
 
     repler = Repler([])
     SF = None
+    modules = ModuleRegistry()
 
     try:
         inp = input("ଘ(੭ ˘ ᵕ˘)━☆ﾟ.*･｡ﾟᵕ꒳ᵕ~ ")
         while True:
+            if len(repler.lines) == 0 and inp.strip().startswith("wewoad"):
+                # wewoad [fiwe] makes the next woad uv that fiwe (or evewy fiwe) wun it again
+                fname = inp.strip()[len("wewoad"):].strip()
+                n = modules.reload(modules.path("", fname) if fname else None)
+                print(f"Fowgot {n} moduwe{'' if n == 1 else 's'} (◕ᴗ◕✿)")
+                inp = input("ଘ(੭ ˘ ᵕ˘)━☆ﾟ.*･｡ﾟᵕ꒳ᵕ~ ")
+                continue
             repler.lines.append(inp)
             repler.reset()
 
@@ -45,7 +54,7 @@ def main():
                 p = Pawser(t)
                 p.parse_START()
 
-                runner = Runner(p.tree, SF)
+                runner = runnerClass(p.tree, SF, modules=modules)
                 runner.run()
                 SF = runner.globals
 
@@ -1,19 +1,63 @@
 
-from pawser.IStream import Filestream
-from pawser.Tokenizer import Tokenizer
-from pawser.Pawser import Pawser
+
+from pawser.IStream import Stdinstream
+from executor import Cache
 from executor.Runner import Runner
+from executor.VM import VMRunner
+from executor.Closures import ClosureRunner
+from executor.Transpiler import Transpiler, PythonRunner
+from executor.Optimizer import Optimizer
+from executor.Pwofiler import Pwofiler, PwofileRunner
+from executor.Hooks import Hooks
 
 import os
+import sys
 
-def main(root: str):
-    fs = Filestream(root)
-    tokens = Tokenizer(fs)
+ENGINES = {
+    "twee": Runner,
+    "vm": VMRunner,
+    "cwosure": ClosureRunner,
+    "python": PythonRunner
+}
 
-    p = Pawser(tokens)
-    p.parse_START()
-    # print(p.tree)
+def main(root: str, engine: str = "twee", emitPython: bool = False, maxDepth: int = None, optimize: bool = True, optimizeReport: bool = False, pwofile: bool = False, pwofileStacks: str = None, hooks: Hooks = None):
+    if root == "-":
+        tree = Cache.CACHE.parse(Stdinstream())
+        root = "<stdin>"
+        tree.name = root
+    else:
+        tree = Cache.CACHE.load(root)
+    # print(tree)
 
-    r = Runner(p.tree, basedir=os.path.dirname(root))
-    r.run()
+    Runner.optimizer = Optimizer() if optimize else None
+    if emitPython:
+        # Setting up a wunnew optimizes the twee, so this pwints what --engine python wouwd wun
+        Runner(tree, basedir=os.path.dirname(root))
+        print(Transpiler(root).transpileFile(tree).source, end="")
+        return
 
+    if maxDepth is not None:
+        VMRunner.maxDepth = maxDepth
+    cls = ENGINES[engine]
+    if pwofile or pwofileStacks is not None:
+        # Pwofiwing awways wawks the twee, the compiwed engines have no pwace to hook in
+        PwofileRunner.pwofiler = Pwofiler()
+        cls = PwofileRunner
+    if hooks is not None:
+        if hooks.walks() and cls is not PwofileRunner:
+            # Fwunction and statement hooks need the twee engine too
+            cls = Runner
+        cls = hooks.engine(cls)
+    try:
+        r = cls(tree, basedir=os.path.dirname(root))
+        r.run()
+    finally:
+        if optimizeReport and Runner.optimizer is not None:
+            for c in Runner.optimizer.changes:
+                print(f"optimizew: {c}", file=sys.stderr)
+        if issubclass(cls, PwofileRunner):
+            if pwofile:
+                PwofileRunner.pwofiler.report(sys.stderr)
+            if pwofileStacks is not None:
+                with open(pwofileStacks, 'w') as f:
+                    PwofileRunner.pwofiler.collapsed(f)
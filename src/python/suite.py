@@ -0,0 +1,164 @@
+
+
+# Wuns the benchmarks/ wowkwoads, times each phase and checks them against a saved basewine
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+import runner
+import VERSION
+from pawser.IStream import Bufferstream
+from pawser.Tokenizer import Tokenizer, TokenType
+from executor import Cache
+from executor.Runner import Runner
+from executor.Optimizer import Optimizer
+from executor.Hooks import Hooks
+
+BENCHMARKS = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'benchmarks'))
+
+def tokenize(data: bytes) -> Tuple[float, int]:
+    start = time.perf_counter()
+    t = Tokenizer(Bufferstream(data))
+    tokens = 0
+    while not t.getToken().isType(TokenType.EOF):
+        tokens += 1
+    return time.perf_counter() - start, tokens
+
+def parse(data: bytes) -> float:
+    # Incwudes tokenizing, which gets taken back out when wepowting
+    start = time.perf_counter()
+    Cache.CACHE.parse(Bufferstream(data))
+    return time.perf_counter() - start
+
+def execute(path: str, data: bytes, cls: type, scale: int) -> float:
+    tree = Cache.CACHE.parse(Bufferstream(data))
+    tree.name = path
+    Runner.optimizer = Optimizer()
+    oldStdin = sys.stdin
+    sys.stdin = io.StringIO(f"{scale}\n")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            cls(tree, basedir=os.path.dirname(path)).run()
+            return time.perf_counter() - start
+    finally:
+        sys.stdin = oldStdin
+
+def peak(path: str, data: bytes, cls: type, scale: int) -> int:
+    tracemalloc.start()
+    try:
+        execute(path, data, cls, scale)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def statements(path: str, data: bytes, scale: int) -> int:
+    # The same twee wuns on evewy engine, so the twee wawkew's count howds fow aww uv them
+    count = [ 0 ]
+    hooks = Hooks()
+    @hooks.on("statement")
+    def counted(node, seconds: float) -> None:
+        count[0] += 1
+    execute(path, data, hooks.engine(Runner), scale)
+    return count[0]
+
+def measure(path: str, engines: List[str], scale: int, repeat: int) -> List[Dict]:
+    with open(path, 'rb') as f:
+        data = f.read()
+    name = os.path.splitext(os.path.basename(path))[0]
+    tok, tokens = min(tokenize(data) for _ in range(repeat))
+    par = max(0.0, min(parse(data) for _ in range(repeat)) - tok)
+    lines = data.count(b'\n') + 1
+    ran = statements(path, data, scale)
+    results = []
+    for e in engines:
+        cls = runner.ENGINES[e]
+        exe = min(execute(path, data, cls, scale) for _ in range(repeat))
+        results.append({
+            "workload": name,
+            "engine": e,
+            "tokenize": tok,
+            "parse": par,
+            "execute": exe,
+            "tokens": tokens,
+            "lines": lines,
+            "statements": ran,
+            "tokensPerSecond": tokens / tok if tok > 0 else None,
+            "linesPerSecond": lines / par if par > 0 else None,
+            "statementsPerSecond": ran / exe if exe > 0 else None,
+            "peakBytes": peak(path, data, cls, scale)
+        })
+    return results
+
+def compare(results: List[Dict], baseline: Dict, threshold: float) -> List[str]:
+    # Anything that got swowew (ow bigger) than the basewine by mowe than threshold
+    old = { (r["workload"], r["engine"]): r for r in baseline["results"] }
+    flagged = []
+    for r in results:
+        b = old.get((r["workload"], r["engine"]))
+        if b is None:
+            continue
+        for key in ("execute", "peakBytes"):
+            if b[key] and r[key] > b[key] * (1 + threshold):
+                flagged.append(f"{r['workload']} on {r['engine']}: {key} {b[key]:.4g} -> {r[key]:.4g} ({r[key] / b[key]:.2f}x)")
+    return flagged
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Wun the benchmark wowkwoads and compawe them against a basewine")
+    ap.add_argument("files", nargs="*", help="Wowkwoads to wun (defauwts to benchmarks/*.uwu)")
+    ap.add_argument("--engine", action="append", choices=list(runner.ENGINES),
+        help="Engine to time (can be given mowe than once, defauwts to all)")
+    ap.add_argument("--scale", type=int, default=1, help="Fed to each wowkwoad on stdin to make it biggew")
+    ap.add_argument("--repeat", type=int, default=3, help="Wuns pew measuwement, the fastest one counts")
+    ap.add_argument("--json", metavar="FILE", help="Wite the wesuwts as JSON to FILE (- fow stdout)")
+    ap.add_argument("--baseline", metavar="FILE", help="JSON fwom an eawwiew --json wun to check fow wegwessions against")
+    ap.add_argument("--threshold", type=float, default=0.1, help="How much swowew than the basewine counts as a wegwession (defauwt 0.1, 10%%)")
+    args = ap.parse_args(argv)
+
+    files = args.files or sorted(glob.glob(os.path.join(BENCHMARKS, '*.uwu')))
+    engines = args.engine or list(runner.ENGINES)
+    results = []
+    for f in files:
+        for r in measure(f, engines, args.scale, args.repeat):
+            results.append(r)
+            print(f"{r['engine']:8} {r['workload']:14} tokenize {r['tokenize'] * 1000:7.2f}ms  parse {r['parse'] * 1000:7.2f}ms"
+                f"  execute {r['execute']:8.3f}s  {r['statementsPerSecond'] or 0:12,.0f} statements/s  peak {r['peakBytes'] / 1024:9,.0f} KiB",
+                file=sys.stderr if args.json == "-" else sys.stdout)
+
+    report = {
+        "version": VERSION.VERSION,
+        "python": platform.python_version(),
+        "scale": args.scale,
+        "results": results
+    }
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("scale") != args.scale:
+            print(f"Basewine was wun at scawe {baseline.get('scale')}, not {args.scale}", file=sys.stderr)
+            return 2
+        flagged = compare(results, baseline, args.threshold)
+        for line in flagged:
+            print(f"wegwession: {line}", file=sys.stderr)
+        if flagged:
+            return 1
+        print("no wegwessions >w<", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())